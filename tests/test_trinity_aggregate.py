@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+tests/test_trinity_aggregate.py — Online aggregation across seeds
+"""
+
+import numpy as np
+import pytest
+from trinity_dynamics.config import X0_LIST, A_LIST
+from trinity_dynamics.sensitivity import param_grid, run_sensitivity
+from trinity_dynamics.aggregate import P2Quantile, RunningStats
+
+def test_aggregate_sweep_matches_groupby():
+    """Per-scenario running stats equal a groupby of the full rows, which are only kept on request."""
+    grid = param_grid(x0_list=X0_LIST[:2], a_list=A_LIST[:1], dt_list=[0.01], s_list=[1.0, 1.01], seeds=[1, 2, 3, 4])
+    agg, rows = run_sensitivity(steps=300, grid=grid, aggregate=True, keep_rows=True, chunk_size=3)
+    assert len(agg) == 4 and (agg["runs"] == 4).all()
+    g = rows.groupby(["x0", "s"], sort=False)["energy"]
+    np.testing.assert_allclose(agg["energy_mean"], g.mean(), rtol=1e-12)
+    np.testing.assert_allclose(agg["energy_std"], g.std(), rtol=1e-9)
+    np.testing.assert_allclose(agg["energy_q50"], g.median(), rtol=1e-12)
+    np.testing.assert_array_equal(agg["energy_max"], g.max())
+    assert (agg["energy_ci_lo"] <= agg["energy_mean"]).all() and (agg["energy_mean"] <= agg["energy_ci_hi"]).all()
+    only = run_sensitivity(steps=300, grid=grid, aggregate=True)
+    np.testing.assert_array_equal(only["energy_mean"], agg["energy_mean"])
+
+def test_quantile_sketch_and_nonfinite_values():
+    """P² tracks quantiles of a long stream; infinities are counted, not averaged."""
+    xs = np.random.default_rng(0).normal(size=20000)
+    for p in (0.05, 0.5, 0.95):
+        sk = P2Quantile(p)
+        for x in xs:
+            sk.add(x)
+        assert sk.value() == pytest.approx(np.quantile(xs, p), abs=0.05)
+    st = RunningStats()
+    for x in (1.0, float("inf"), 3.0):
+        st.add(x)
+    out = st.summary("conv_time")
+    assert out["conv_time_mean"] == 2.0 and out["conv_time_nonfinite"] == 1
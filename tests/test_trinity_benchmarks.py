@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+tests/test_trinity_benchmarks.py — Benchmark suite and regression gating
+"""
+
+import json
+import pytest
+from trinity_dynamics import benchmarks
+
+def test_benchmark_results_and_comparison(tmp_path, capsys):
+    """Results carry machine metadata; compare flags a slowed-down median and exits non-zero."""
+    base = str(tmp_path / "base.json")
+    report = benchmarks.run_benchmarks(["compute_metrics[len=1000]", "pipeline"], repeats=2, out=base)
+    assert set(report["results"]) == {"compute_metrics[len=1000]", "pipeline[main,stubbed plots]"}
+    assert report["machine"]["cpu_count"] and report["machine"]["numpy"]
+    assert len(report["results"]["pipeline[main,stubbed plots]"]["times"]) == 2
+
+    slow = json.loads(open(base).read())
+    slow["results"]["compute_metrics[len=1000]"]["median"] *= 1.5
+    new = str(tmp_path / "new.json")
+    with open(new, "w") as f:
+        json.dump(slow, f)
+    rows = {r["name"]: r for r in benchmarks.compare(base, new)}
+    assert rows["compute_metrics[len=1000]"]["slower"] and not rows["pipeline[main,stubbed plots]"]["slower"]
+    assert benchmarks.main(["compare", base, new]) == 1
+    assert benchmarks.main(["compare", base, new, "--threshold", "0.6"]) == 0
+    assert "SLOWER" in capsys.readouterr().out
+    with pytest.raises(ValueError):
+        benchmarks.run_benchmarks(["nope"])
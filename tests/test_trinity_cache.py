@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+tests/test_trinity_cache.py — Content-addressed result cache
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from trinity_dynamics import cache as cache_mod, sensitivity
+from trinity_dynamics.cache import ResultCache, code_version
+from trinity_dynamics.config import X0_LIST, A_LIST
+from trinity_dynamics.sensitivity import param_grid, run_sensitivity
+
+def test_sweep_only_simulates_new_points(tmp_path, monkeypatch):
+    """A second sweep with one extra s value simulates only the new grid points."""
+    cache = ResultCache(str(tmp_path / "cache"))
+    grid = param_grid(x0_list=X0_LIST[:2], a_list=A_LIST[:1], dt_list=[0.01], s_list=[1.0], seeds=[42, 43])
+    first = run_sensitivity(steps=200, grid=grid, cache=cache)
+
+    simulated, chunk = [], sensitivity._simulate_chunk
+    def counting(sim, points, *args, **kwargs):
+        simulated.extend(points)
+        return chunk(sim, points, *args, **kwargs)
+    monkeypatch.setattr(sensitivity, "_simulate_chunk", counting)
+    wider = param_grid(x0_list=X0_LIST[:2], a_list=A_LIST[:1], dt_list=[0.01], s_list=[1.0, 1.01], seeds=[42, 43])
+    second = run_sensitivity(steps=200, grid=wider, cache=cache)
+    assert len(simulated) == 4 and all(p["s"] == 1.01 for p in simulated)
+    pd.testing.assert_frame_equal(second[second["s"] == 1.0].reset_index(drop=True), first)
+
+    simulated.clear()
+    run_sensitivity(steps=300, grid=grid, cache=cache)
+    assert len(simulated) == len(grid)
+
+def test_config_edits_keep_cached_points(tmp_path, monkeypatch):
+    """Editing config.py and growing S_LIST in it still hits every existing default-grid point."""
+    cache = ResultCache(str(tmp_path / "cache"))
+    for name, value in (("X0_LIST", X0_LIST[:2]), ("A_LIST", A_LIST[:1]), ("DT_LIST", [0.01]),
+                        ("S_LIST", [1.0]), ("SEEDS", [42, 43])):
+        monkeypatch.setattr(sensitivity, name, value)
+    first = run_sensitivity(steps=200, cache=cache)
+
+    # config.py's source now hashes differently, as after any edit to it
+    real = cache_mod.source_hash
+    monkeypatch.setattr(cache_mod, "source_hash",
+                        lambda modules, salt="": "edited" if "config" in modules else real(modules, salt))
+    code_version.cache_clear()
+    monkeypatch.setattr(sensitivity, "S_LIST", [1.0, 1.01])
+    simulated, chunk = [], sensitivity._simulate_chunk
+    def counting(sim, points, *args, **kwargs):
+        simulated.extend(points)
+        return chunk(sim, points, *args, **kwargs)
+    monkeypatch.setattr(sensitivity, "_simulate_chunk", counting)
+    try:
+        second = run_sensitivity(steps=200, cache=cache)
+    finally:
+        code_version.cache_clear()
+    assert len(simulated) == 4 and all(p["s"] == 1.01 for p in simulated)
+    pd.testing.assert_frame_equal(second[second["s"] == 1.0].reset_index(drop=True), first)
+
+def test_cache_eviction_is_size_bounded(tmp_path):
+    """Eviction drops the least recently used entries until the cache fits."""
+    cache = ResultCache(str(tmp_path), max_bytes=12_000)
+    m = {"conv_time": 1.0, "entropy": 0.5, "osc_freq": 0.0, "stability": 0.0, "energy": 2.0,
+         "final_state": np.array([0.2, 0.3, 0.5])}
+    for i in range(4):
+        cache.put(f"{i:02d}key", m, np.zeros((200, 3)))
+        os.utime(tmp_path / f"{i:02d}" / f"{i:02d}key.json", (1000 + i, 1000 + i))
+    cache.get("00key")
+    cache.evict()
+    assert cache.get("00key") is not None and cache.get("01key") is None
+    m2, x = cache.get("03key", trajectory=True)
+    np.testing.assert_array_equal(m2["final_state"], m["final_state"])
+    assert x.shape == (200, 3)
+
+def test_read_only_cache_still_answers_hits(tmp_path, monkeypatch):
+    """A cache whose entries cannot be touched (read-only or shared) still returns its hits."""
+    cache = ResultCache(str(tmp_path))
+    cache.put("00key", {"conv_time": 1.0, "entropy": 0.5, "osc_freq": 0.0, "stability": 0.0, "energy": 2.0,
+                        "final_state": None})
+
+    def denied(*args, **kwargs):
+        raise PermissionError("read-only file system")
+    monkeypatch.setattr(cache_mod.os, "utime", denied)
+    assert cache.get("00key")["energy"] == 2.0
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+tests/test_trinity_columnar.py — Streaming Parquet sweep output
+"""
+
+import numpy as np
+import pytest
+from trinity_dynamics.config import X0_LIST, A_LIST
+from trinity_dynamics.sensitivity import param_grid, run_sensitivity
+
+pytest.importorskip("pyarrow")
+from trinity_dynamics.columnar import read_sweep, scenario_id
+
+def test_streamed_sweep_round_trips_and_filters(tmp_path):
+    """Row groups written per chunk read back as the in-memory sweep, and filters prune rows."""
+    import pyarrow.parquet as pq
+    grid = param_grid(x0_list=X0_LIST[:2], a_list=A_LIST[:2], dt_list=[0.01, 0.02], s_list=[1.0, 1.01], seeds=[42])
+    df = run_sensitivity(steps=200, grid=grid)
+    path = str(tmp_path / "sweep.parquet")
+    assert run_sensitivity(steps=200, grid=grid, out=path, chunk_size=5) == path
+    assert pq.ParquetFile(path).num_row_groups == 4
+
+    back = read_sweep(path)
+    for col in ["dt", "s", "seed", "conv_time", "entropy", "stability", "energy"]:
+        np.testing.assert_array_equal(back[col], df[col])
+    np.testing.assert_array_equal(back[["x0_0", "x0_1", "x0_2"]].values[0], grid[0]["x0"])
+    assert back["scenario"].nunique() == 4 and back["scenario"][0] == scenario_id(grid[0]["x0"], grid[0]["A"])
+
+    part = read_sweep(path, columns=["s", "energy"], filters=[("s", "==", 1.01), ("dt", "<", 0.015)])
+    assert list(part.columns) == ["s", "energy"] and len(part) == 4
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+tests/test_trinity_critical.py — Critical-s search
+"""
+
+import pytest
+from trinity_dynamics.config import X0_LIST
+from trinity_dynamics.critical import find_critical_s
+
+def test_threshold_search_brackets_crossing():
+    """Bisection finds where mean conv_time crosses the level in tens of simulations."""
+    r = find_critical_s(metric="conv_time", level=5.0, s_range=(0.5, 2.0), x0=X0_LIST[1], steps=1000,
+                        seeds=[1, 2, 3], xtol=1e-2)
+    assert r["found"] and r["ci"][0] <= r["s"] <= r["ci"][1]
+    assert r["simulations"] == 3 * len(r["probes"]) < 60
+    probes = r["probes"]
+    assert (probes[probes["s"] < r["ci"][0]]["mean"] > 5.0).all()
+    assert (probes[probes["s"] > r["ci"][1]]["mean"] < 5.0).all()
+
+def test_minimum_search_and_validation():
+    """Golden-section search returns an in-range minimiser; unknown modes are rejected."""
+    r = find_critical_s(metric="energy", mode="minimum", s_range=(0.8, 1.2), steps=500, seeds=[1, 2], xtol=0.02)
+    assert 0.8 <= r["ci"][0] <= r["s"] <= r["ci"][1] <= 1.2
+    assert r["probes"]["mean"].min() == pytest.approx(r["probes"].set_index("s").loc[r["s"], "mean"])
+    with pytest.raises(ValueError):
+        find_critical_s(mode="maximum")
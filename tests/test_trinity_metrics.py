@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+tests/test_trinity_metrics.py — Trajectory metrics
+"""
+
+import numpy as np
+import pytest
+from trinity_dynamics.config import X0_LIST, A_LIST
+from trinity_dynamics.metrics import compute_metrics, compute_metrics_batch, split_metrics_batch
+from trinity_dynamics.simulation import TrinitySimulation
+
+KEYS = ["conv_time", "entropy", "osc_freq", "stability", "energy"]
+
+@pytest.fixture(scope="module")
+def trajectories():
+    sim = TrinitySimulation(n_agents=3)
+    x0 = np.stack([X0_LIST[i % 4] for i in range(8)])
+    A = np.stack([A_LIST[i // 2 % 4] for i in range(8)])
+    return sim.run_ensemble(x0, A, s_factor=np.linspace(1.0, 1.02, 8), dt=0.01, steps=1500, seeds=range(8))
+
+def test_batch_metrics_match_single_runs(trajectories):
+    """Stacked trajectories give the per-run compute_metrics values."""
+    cols = compute_metrics_batch(trajectories, 0.01)
+    for b, x in enumerate(trajectories):
+        m = compute_metrics(x, 0.01)
+        for k in KEYS:
+            assert cols[k][b] == pytest.approx(m[k], rel=1e-12), k
+        np.testing.assert_array_equal(cols["final_state"][b], m["final_state"])
+
+def test_ragged_batch_metrics(trajectories):
+    """Ragged inputs honour each trajectory's own length, including degenerate ones."""
+    lengths = [1500, 1200, 700, 150, 99, 2, 1, 900]
+    ragged = [x[:n] for x, n in zip(trajectories, lengths)]
+    rows = split_metrics_batch(compute_metrics_batch(ragged, 0.01))
+    for x, row in zip(ragged, rows):
+        m = compute_metrics(x, 0.01)
+        for k in KEYS:
+            assert row[k] == pytest.approx(m[k], rel=1e-12), k
+
+def test_batch_peak_count_handles_plateaus():
+    """Plateaued maxima count once, as in scipy.signal.find_peaks."""
+    steps = np.array([0, 1, 1, 1, 0, 2, 2, 3, 3, 1, 1, 5, 5], dtype=float)
+    x = np.zeros((len(steps) + 1, 2))
+    x[1:, 0] = np.cumsum(steps)
+    assert compute_metrics_batch(x[None], 1.0)["osc_freq"][0] == compute_metrics(x, 1.0)["osc_freq"]
+
+@pytest.mark.parametrize("method", ["euler", "dopri5"])
+def test_online_metrics_match_compute_metrics(method):
+    """Metrics accumulated step by step agree with scoring the recorded trajectory."""
+    sim = TrinitySimulation(n_agents=3)
+    for x0, A in [(X0_LIST[0], A_LIST[0]), (X0_LIST[1], A_LIST[3])]:
+        x = sim.run_simulation(x0, A, s_factor=1.01, steps=3000, seed=3, method=method, metrics=True)
+        online, ref = sim.last_run["metrics"], compute_metrics(x, 0.01)
+        for k in ["conv_time", "osc_freq", "entropy"]:
+            assert online[k] == ref[k], k
+        np.testing.assert_array_equal(online["final_state"], ref["final_state"])
+        assert online["energy"] == pytest.approx(ref["energy"], rel=1e-12)
+        assert online["stability"] == pytest.approx(ref["stability"], rel=1e-10)
+
+        sim.run_simulation(x0, A, s_factor=1.01, steps=3000, seed=3, method=method, record="none", metrics=True)
+        assert sim.last_run["metrics"]["energy"] == online["energy"]
+    with pytest.raises(ValueError):
+        sim.run_simulation(X0_LIST[0], A_LIST[0], s_factor=1.0, tol=1e-4, metrics=True)
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+tests/test_trinity_package.py — Package exports and import behaviour
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, "trinity_dynamics", "data")
+
+def _run(code):
+    """Runs code in a fresh interpreter, so imports start from scratch."""
+    return subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True,
+                          check=True).stdout
+
+def test_package_import_is_lazy_and_side_effect_free():
+    """TrinitySimulation loads without pandas, scipy.signal or plotting, and no data/ dir appears."""
+    code = ("import sys; from trinity_dynamics import TrinitySimulation{}; "
+            "print(sorted(m for m in ('pandas', 'scipy.signal', 'matplotlib', 'reportlab') if m in sys.modules))")
+    existed = os.path.exists(DATA_DIR)
+    assert _run(code.format("")).strip() == "[]"
+    assert os.path.exists(DATA_DIR) == existed
+    out = _run(code.format(", main") + "; print(callable(main))")
+    assert out.split()[-1] == "True" and os.path.exists(DATA_DIR) == existed
+
+def test_main_stays_the_function_after_submodule_import():
+    """Importing the main submodule first (as benchmarks does) still leaves main() callable."""
+    out = _run("import importlib, sys, trinity_dynamics.benchmarks; importlib.import_module('trinity_dynamics.main'); "
+               "import trinity_dynamics as t; from trinity_dynamics import main; "
+               "print(callable(main), main is t.main is sys.modules['trinity_dynamics.main'].main)")
+    assert out.split() == ["True", "True"]
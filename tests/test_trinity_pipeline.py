@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+tests/test_trinity_pipeline.py — Stage graph with artifact caching
+"""
+
+import importlib
+import json
+import threading
+import pytest
+from trinity_dynamics.cache import ResultCache
+from trinity_dynamics.pipeline import Stage, run_stages
+
+def _graph(tmp_path, calls, barrier=None):
+    """source -> (left, right) -> join; left and right must overlap when a barrier is given."""
+    path = lambda name: str(tmp_path / name)
+
+    def writer(name, text):
+        def run():
+            calls.append(name)
+            if barrier is not None and name in ("left", "right"):
+                barrier.wait(timeout=5)
+            with open(path(name), "w") as f:
+                f.write(text())
+        return run
+    read = lambda name: open(path(name)).read()
+    return [
+        Stage("join", writer("join", lambda: read("left") + read("right")), [path("join")], [path("left"), path("right")]),
+        Stage("left", writer("left", lambda: read("source") + "L"), [path("left")], [path("source")]),
+        Stage("right", writer("right", lambda: read("source") + "R"), [path("right")], [path("source")],
+              sources=["report"], params=1),
+        Stage("source", writer("source", lambda: "x"), [path("source")]),
+    ]
+
+def test_stages_run_in_order_concurrently_and_skip_when_unchanged(tmp_path):
+    """Independent stages overlap; a second run skips everything; changed params re-run a stage only."""
+    calls = []
+    status = run_stages(_graph(tmp_path, calls, threading.Barrier(2)), str(tmp_path / "state"))
+    assert set(status.values()) == {"ran"} and calls[0] == "source" and calls[-1] == "join"
+    assert (tmp_path / "join").read_text() == "xLxR"
+
+    calls.clear()
+    assert set(run_stages(_graph(tmp_path, calls), str(tmp_path / "state")).values()) == {"skipped"}
+    assert calls == []
+    stages = _graph(tmp_path, calls)
+    stages[2].params = 2
+    status = run_stages(stages, str(tmp_path / "state"))
+    # right's output is byte-identical, so join's input fingerprint is unchanged too
+    assert status == {"source": "skipped", "left": "skipped", "right": "ran", "join": "skipped"}
+
+def test_failed_stage_blocks_dependents(tmp_path):
+    """A raising stage is reported failed; stages needing its outputs are not run, optional readers are."""
+    calls = []
+    stages = _graph(tmp_path, calls)
+
+    def boom():
+        raise RuntimeError("no")
+    stages[1].func = boom
+    stages.append(Stage("tail", lambda: (tmp_path / "tail").touch(), [str(tmp_path / "tail")],
+                        [str(tmp_path / "right")], optional=[str(tmp_path / "left")]))
+    status = run_stages(stages, str(tmp_path / "state"))
+    assert status == {"source": "ran", "left": "failed", "right": "ran", "join": "blocked", "tail": "ran"}
+    with pytest.raises(ValueError):
+        run_stages([Stage("a", None, ["x"], ["y"]), Stage("b", None, ["y"], ["x"])], str(tmp_path / "state"))
+
+def test_baseline_stage_runs_through_run_baseline_and_compare(tmp_path, monkeypatch):
+    """The public baseline entry point still plots; the baseline stage reuses it without plotting."""
+    main_mod = importlib.import_module("trinity_dynamics.main")  # the package attribute is the function
+    drawn = []
+    monkeypatch.setattr(main_mod, "plot_trajectories_matplotlib",
+                        lambda x_w, x_c, dt=None, out_png=None: drawn.append(out_png))
+    cache = ResultCache(str(tmp_path / "cache"))
+    _, (x_c, m_c), png = main_mod.run_baseline_and_compare(cache, png_path=str(tmp_path / "cmp.png"))
+    assert drawn == [png] == [str(tmp_path / "cmp.png")]
+
+    baseline = next(st for st in main_mod.build_stages(str(tmp_path), cache) if st.name == "baseline")
+    assert "main" in baseline.sources
+    baseline.func()
+    with open(tmp_path / "baseline.json") as f:
+        assert json.load(f)["with"]["energy"] == m_c["energy"]
+    assert len(drawn) == 1
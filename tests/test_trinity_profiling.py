@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+tests/test_trinity_profiling.py — Timing spans and trace export
+"""
+
+import json
+import os
+import pytest
+from trinity_dynamics import profiling
+from trinity_dynamics.config import X0_LIST, A_LIST
+from trinity_dynamics.sensitivity import param_grid, run_sensitivity
+
+@pytest.fixture
+def profile():
+    profiling.reset()
+    profiling.enable()
+    yield profiling
+    profiling.enable(False)
+    profiling.reset()
+
+def test_sweep_spans_include_pool_workers(profile, tmp_path):
+    """Per-run simulate/metrics spans come back from worker processes; trace and summary agree."""
+    grid = param_grid(x0_list=X0_LIST[:2], a_list=A_LIST[:1], dt_list=[0.01], s_list=[1.0, 1.01], seeds=[1, 2])
+    run_sensitivity(steps=200, grid=grid, jobs=2, chunk_size=2, tol=1e-4)
+    path = str(tmp_path / "trace.json")
+    n = profile.export_chrome_trace(path)
+    with open(path) as f:
+        events = json.load(f)["traceEvents"]
+    assert len(events) == n and all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+    sims = [e for e in events if e["name"] == "simulate"]
+    assert len(sims) == len(grid) and {e["pid"] for e in sims} != {os.getpid()}
+
+    table = profile.summary().set_index("span")
+    assert table.loc["run_sensitivity", "count"] == 1 and table.loc["simulate", "count"] == len(grid)
+    row = table.loc["metrics"]
+    assert row["count"] == len(grid) and row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"]
+
+def test_disabled_spans_record_nothing():
+    """With profiling off, spans and decorated functions leave no events."""
+    profiling.reset()
+    with profiling.span("x", a=1):
+        pass
+    assert profiling.profiled()(lambda v: v + 1)(1) == 2
+    assert profiling.drain() == [] and profiling.summary().empty
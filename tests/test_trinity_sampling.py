@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+tests/test_trinity_sampling.py — Quasi-random sampling and Sobol indices
+"""
+
+import numpy as np
+import pytest
+from trinity_dynamics.config import SAMPLE_BOUNDS
+from trinity_dynamics.sampling import sample_grid, saltelli_grid, sobol_indices, adaptive_sweep, factor_slices
+
+@pytest.mark.parametrize("method", ["sobol", "lhs"])
+def test_samples_cover_valid_parameters(method):
+    """Samples start on the simplex with symmetric unit-diagonal A and dt, s in range."""
+    grid = sample_grid(64, method=method)
+    x0 = np.stack([p["x0"] for p in grid])
+    np.testing.assert_allclose(x0.sum(axis=1), 1.0)
+    assert (x0 >= 0).all()
+    for p in grid:
+        np.testing.assert_array_equal(p["A"], p["A"].T)
+        np.testing.assert_array_equal(np.diag(p["A"]), 1.0)
+    s = np.array([p["s"] for p in grid])
+    lo, hi = SAMPLE_BOUNDS["s"]
+    assert lo <= s.min() and s.max() < hi and s.std() > (hi - lo) / 4
+
+def test_sobol_indices_recover_known_function():
+    """On f = 4·u_s + u_dt, s carries 16/17 of the variance and x0, A none."""
+    n = 512
+    cols = factor_slices(3)
+    u = np.stack([p["u"] for p in saltelli_grid(n)])
+    f = 4 * u[:, cols["s"]].ravel() + u[:, cols["dt"]].ravel()
+    idx = sobol_indices(f, n)
+    assert idx.loc["s", "ST"] == pytest.approx(16 / 17, abs=0.05)
+    assert idx.loc["dt", "S1"] == pytest.approx(1 / 17, abs=0.03)
+    assert abs(idx.loc["x0", "ST"]) < 1e-12 and abs(idx.loc["A", "ST"]) < 1e-12
+
+def test_adaptive_sweep_adds_rounds():
+    """Refinement rounds add new, distinct points to the sweep."""
+    df = adaptive_sweep(n=16, rounds=2, per_round=8, steps=300, batch_size=16)
+    assert df.groupby("round").size().tolist() == [16, 8, 8]
+    assert df["u"].nunique() == len(df)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+tests/test_trinity_sensitivity.py — Parallel, journaled and surrogate sweeps
+"""
+
+import numpy as np
+import pytest
+from trinity_dynamics.config import X0_LIST, A_LIST
+from trinity_dynamics.sensitivity import param_grid, run_sensitivity
+
+def test_parallel_sweep_matches_serial_sweep():
+    """Chunks run in worker processes merge back into exactly the serial rows, in grid order."""
+    grid = param_grid(x0_list=X0_LIST[:2], a_list=A_LIST[:2], dt_list=[0.01, 0.02], s_list=[1.0], seeds=[42, 43])
+    serial = run_sensitivity(steps=200, grid=grid)
+    parallel = run_sensitivity(steps=200, grid=grid, jobs=2, chunk_size=3)
+    assert serial.equals(parallel)
+
+def test_interrupted_sweep_resumes_from_journal(tmp_path):
+    """A journaled sweep killed mid-way re-runs only the unfinished chunks, with progress reports."""
+    grid = param_grid(x0_list=X0_LIST[:2], a_list=A_LIST[:2], dt_list=[0.01, 0.02], s_list=[1.0], seeds=[42, 43])
+    serial = run_sensitivity(steps=200, grid=grid)
+    journal = str(tmp_path / "sweep.journal")
+
+    def interrupt(report):
+        if report["completed"] >= 6:
+            raise KeyboardInterrupt
+    with pytest.raises(KeyboardInterrupt):
+        run_sensitivity(steps=200, grid=grid, chunk_size=3, journal=journal, progress=interrupt)
+
+    reports = []
+    resumed = run_sensitivity(steps=200, grid=grid, chunk_size=3, journal=journal, progress=reports.append)
+    assert serial.equals(resumed)
+    last = reports[-1]
+    assert last["completed"] == last["total"] == len(grid) and last["simulated"] == len(grid) - 6
+    assert last["eta"] == 0 and last["sims_per_sec"] > 0 and len(last["slowest"]) <= 5
+
+def test_surrogate_sweep_simulates_a_fraction():
+    """On a smooth s axis the GP predicts most rows; simulated rows match the plain sweep exactly."""
+    grid = param_grid(x0_list=X0_LIST[:1], a_list=A_LIST[:1], dt_list=[0.01], s_list=list(np.linspace(0.9, 1.1, 40)),
+                      seeds=[1])
+    full = run_sensitivity(steps=500, grid=grid)
+    sur = run_sensitivity(steps=500, grid=grid, surrogate=0.1)
+    sim = (sur["source"] == "simulated").values
+    assert sim.sum() <= len(grid) // 3 and (sur.loc[sim, "energy_sd"] == 0).all()
+    np.testing.assert_array_equal(sur.loc[sim, "energy"], full.loc[sim, "energy"])
+    err = np.abs(sur.loc[~sim, "energy"] - full.loc[~sim, "energy"])
+    assert err.max() < 0.05 * np.ptp(full["energy"])
+    assert sur.loc[~sim, "entropy"].isna().all()
+
+def test_surrogate_ignores_uncomputed_conv_time():
+    """NaN conv_time (not computed) stays out of the fit instead of counting as never converged."""
+    from trinity_dynamics.sensitivity import _surrogate_results
+    grid = param_grid(x0_list=X0_LIST[:1], a_list=A_LIST[:1], dt_list=[0.01], s_list=list(np.linspace(0.9, 1.1, 40)),
+                      seeds=[1])
+
+    def simulate(points):
+        return [{"conv_time": np.nan if k % 2 else 2.0, "energy": p["s"], "stability": p["s"], "entropy": 0.0,
+                 "osc_freq": 0.0, "final_state": None} for k, p in enumerate(points)]
+    results = _surrogate_results(grid, 0.1, 500, simulate)
+    predicted = [m["conv_time"] for m in results if m["source"] == "predicted"]
+    assert predicted and np.allclose(predicted, 2.0, atol=0.1)
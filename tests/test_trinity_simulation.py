@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+tests/test_trinity_simulation.py — TrinitySimulation kernels and sweeps
+"""
+
+import numpy as np
+import pytest
+from trinity_dynamics.config import DEFAULT_X0, DEFAULT_A, X0_LIST, A_LIST, DT_LIST
+from trinity_dynamics.simulation import TrinitySimulation
+from trinity_dynamics.sensitivity import param_grid, run_sensitivity
+
+@pytest.fixture
+def sim():
+    return TrinitySimulation(n_agents=3)
+
+def test_ensemble_matches_serial_runs(sim):
+    """Each ensemble member reproduces the serial run seeded the same way."""
+    cases = [(DEFAULT_X0, DEFAULT_A, 1.01, 0.01, 7), (X0_LIST[1], A_LIST[2], 1.0, 0.02, 8)]
+    serial = []
+    for x0, A, s, dt, seed in cases:
+        serial.append(sim.run_simulation(x0, A, s_factor=s, dt=dt, steps=300, seed=seed))
+
+    x = sim.run_ensemble(np.stack([c[0] for c in cases]), np.stack([c[1] for c in cases]),
+                         s_factor=[c[2] for c in cases], dt=[c[3] for c in cases],
+                         steps=300, seeds=[c[4] for c in cases])
+    assert x.shape == (2, 300, 3)
+    for b in range(2):
+        np.testing.assert_allclose(x[b], serial[b], rtol=0, atol=1e-12)
+
+def test_ensemble_shared_matrix_and_validation(sim):
+    """A single (n, n) matrix broadcasts across members; bad shapes are rejected."""
+    x = sim.run_ensemble(np.tile(DEFAULT_X0, (4, 1)), DEFAULT_A, s_factor=1.0, steps=50, seeds=[1, 1, 2, 2])
+    np.testing.assert_allclose(x.sum(axis=2), 1.0)
+    np.testing.assert_array_equal(x[0], x[1])
+    with pytest.raises(ValueError):
+        sim.run_ensemble(np.tile(DEFAULT_X0, (4, 1)), np.stack([DEFAULT_A] * 3), s_factor=1.0)
+
+def test_batched_sweep_matches_serial_sweep():
+    """run_sensitivity gives the same rows whether or not grid points are batched."""
+    grid = param_grid(x0_list=X0_LIST[:2], a_list=A_LIST[:2], dt_list=[0.01], s_list=[1.0, 1.01], seeds=[42, 43])
+    serial = run_sensitivity(steps=200, grid=grid)
+    batched = run_sensitivity(steps=200, grid=grid, batch_size=5)
+    assert list(serial.columns) == list(batched.columns)
+    for col in ["conv_time", "entropy", "stability", "energy"]:
+        np.testing.assert_allclose(batched[col], serial[col], rtol=1e-9)
+
+def test_runs_are_reproducible_without_global_rng(sim):
+    """Seeded runs ignore np.random's global state; unseeded runs follow the instance seed."""
+    np.random.seed(0)
+    a = sim.run_simulation(DEFAULT_X0, DEFAULT_A, s_factor=1.0, steps=100, seed=3)
+    np.random.seed(1)
+    b = TrinitySimulation(n_agents=3).run_simulation(DEFAULT_X0, DEFAULT_A, s_factor=1.0, steps=100, seed=3)
+    np.testing.assert_array_equal(a, b)
+
+    first = [TrinitySimulation(n_agents=3, seed=5).run_simulation(DEFAULT_X0, DEFAULT_A, 1.0, steps=100)
+             for _ in range(2)]
+    np.testing.assert_array_equal(first[0], first[1])
+    again = TrinitySimulation(n_agents=3, seed=5)
+    again.run_simulation(DEFAULT_X0, DEFAULT_A, 1.0, steps=100)
+    assert not np.array_equal(again.run_simulation(DEFAULT_X0, DEFAULT_A, 1.0, steps=100), first[0])
+
+def test_early_exit_preserves_convergence_time(sim):
+    """Early exit truncates the run but compute_metrics sees the same convergence step."""
+    from trinity_dynamics.metrics import compute_metrics
+    full = sim.run_simulation(X0_LIST[1], DEFAULT_A, s_factor=1.0, dt=0.01, steps=2000, seed=42)
+    short = sim.run_simulation(X0_LIST[1], DEFAULT_A, s_factor=1.0, dt=0.01, steps=2000, seed=42, tol=1e-4, hold=50)
+    stop = sim.last_run["stop_step"]
+    assert stop is not None and len(short) == stop < 2000
+    np.testing.assert_array_equal(short, full[:stop])
+    assert compute_metrics(short, 0.01)["conv_time"] == compute_metrics(full, 0.01)["conv_time"]
+
+    x = sim.run_ensemble(np.stack([X0_LIST[1], DEFAULT_X0]), DEFAULT_A, s_factor=1.0, steps=2000,
+                         seeds=[42, 43], tol=1e-4, hold=50)
+    stops = sim.last_run["stop_step"]
+    np.testing.assert_allclose(x[0, :stops[0]], short, atol=1e-12)
+    assert x.shape[1] == stops.max()
+
+def test_early_exit_keeps_stability_and_entropy_across_dt():
+    """Runs stop only once settled over the tail window, whatever dt, so the tail metrics agree."""
+    grid = param_grid(x0_list=X0_LIST[:2], a_list=A_LIST[:2], dt_list=DT_LIST, s_list=[1.0], seeds=[42])
+    full = run_sensitivity(steps=2000, grid=grid)
+    for batch_size in (None, 8):
+        short = run_sensitivity(steps=2000, grid=grid, tol=1e-4, batch_size=batch_size)
+        np.testing.assert_array_equal(short["conv_time"], full["conv_time"])
+        np.testing.assert_allclose(short["stability"], full["stability"], rtol=0, atol=1e-7)
+        np.testing.assert_allclose(short["entropy"], full["entropy"], rtol=0, atol=0.01)
+
+@pytest.mark.parametrize("method", ["dopri5", "exponential"])
+def test_adaptive_integrators_take_fewer_steps(sim, method):
+    """Adaptive integrators cover the horizon in far fewer steps and agree with each other."""
+    x = sim.run_simulation(X0_LIST[1], DEFAULT_A, s_factor=1.0, dt=0.01, steps=2000, method=method)
+    info = sim.last_run
+    assert x.shape == (2000, 3)
+    assert info["method"] == method and 0 < info["steps"] < 500 and info["rejected"] >= 0
+    ref = sim.run_simulation(X0_LIST[1], DEFAULT_A, s_factor=1.0, dt=0.01, steps=2000, method="dopri5",
+                             rtol=1e-10, atol=1e-13)
+    np.testing.assert_allclose(x, ref, atol=1e-4)
+
+def test_adaptive_sweep_simulates_each_seed_group_once(tmp_path, monkeypatch):
+    """Noise-free methods run and cache each scenario once, whatever the number of seeds."""
+    grid = param_grid(x0_list=X0_LIST[:2], a_list=A_LIST[:1], dt_list=[0.01], s_list=[1.0], seeds=[1, 2, 3])
+    calls = []
+    run = TrinitySimulation.run_simulation
+    monkeypatch.setattr(TrinitySimulation, "run_simulation",
+                        lambda self, *a, **kw: calls.append(1) or run(self, *a, **kw))
+    df = run_sensitivity(steps=300, grid=grid, method="dopri5", cache=str(tmp_path))
+    assert len(df) == len(grid) and len(calls) == 2
+    assert len(list(tmp_path.glob("*/*.json"))) == 2
+    for _, rows in df.groupby(df["x0"].astype(str)):
+        assert rows["energy"].nunique() == 1
+
+def test_exponential_integrator_handles_stiff_matrix(sim):
+    """A stiff interaction matrix needs many fewer exponential steps than explicit RK steps."""
+    A = DEFAULT_A * 200
+    sim.run_simulation(X0_LIST[1], A, s_factor=1.0, steps=2000, method="dopri5")
+    rk_steps = sim.last_run["steps"]
+    x = sim.run_simulation(X0_LIST[1], A, s_factor=1.0, steps=2000, method="exponential")
+    assert sim.last_run["steps"] * 5 < rk_steps
+    np.testing.assert_allclose(x[-1], [0.0, 0.0, 1.0], atol=1e-6)
+
+def test_recording_modes_match_full_trajectory(sim):
+    """Decimated, ring and no-trajectory recording keep the matching rows of a full run."""
+    full = sim.run_simulation(DEFAULT_X0, DEFAULT_A, s_factor=1.0, steps=500, seed=4)
+    dec = sim.run_simulation(DEFAULT_X0, DEFAULT_A, s_factor=1.0, steps=500, seed=4, record="decimate", every=7)
+    np.testing.assert_array_equal(dec, full[::7])
+    ring = sim.run_simulation(DEFAULT_X0, DEFAULT_A, s_factor=1.0, steps=500, seed=4, record="ring", window=64)
+    np.testing.assert_array_equal(ring, full[-64:])
+    assert sim.last_run["offset"] == 436
+    last = sim.run_simulation(DEFAULT_X0, DEFAULT_A, s_factor=1.0, steps=500, seed=4, record="none")
+    np.testing.assert_array_equal(last, full[-1:])
+
+    ens = sim.run_ensemble(np.stack([DEFAULT_X0] * 2), DEFAULT_A, s_factor=1.0, steps=500, seeds=[4, 5],
+                           record="ring", window=64)
+    assert ens.shape == (2, 64, 3)
+    np.testing.assert_allclose(ens[0], ring, atol=1e-12)
+
+def test_sparse_interaction_matrix_matches_dense(sim):
+    """CSR interaction matrices give the same trajectories as their dense form."""
+    sparse = pytest.importorskip("scipy.sparse")
+    A_sp = sparse.csr_matrix(A_LIST[3])
+    dense = sim.run_simulation(DEFAULT_X0, A_LIST[3], s_factor=1.0, steps=300, seed=9)
+    np.testing.assert_allclose(sim.run_simulation(DEFAULT_X0, A_sp, s_factor=1.0, steps=300, seed=9), dense, atol=1e-12)
+    np.testing.assert_allclose(sim.run_simulation(DEFAULT_X0, A_sp, s_factor=1.0, steps=300, method="dopri5"),
+                               sim.run_simulation(DEFAULT_X0, A_LIST[3], s_factor=1.0, steps=300, method="dopri5"),
+                               atol=1e-12)
+
+    x0 = np.stack([DEFAULT_X0, X0_LIST[1]])
+    ref = sim.run_ensemble(x0, np.stack([A_LIST[3], A_LIST[1]]), s_factor=1.0, steps=300, seeds=[9, 10])
+    blocks = sim.run_ensemble(x0, [A_sp, sparse.csr_matrix(A_LIST[1])], s_factor=1.0, steps=300, seeds=[9, 10])
+    np.testing.assert_allclose(blocks, ref, atol=1e-12)
+    np.testing.assert_allclose(blocks[0], dense, atol=1e-12)
+    shared = sim.run_ensemble(x0, A_sp, s_factor=1.0, steps=300, seeds=[9, 10])
+    np.testing.assert_allclose(shared[0], dense, atol=1e-12)
+
+def test_store_resumes_from_checkpoint(sim, tmp_path, monkeypatch):
+    """A crashed stored run resumes from its last checkpoint and matches an uninterrupted run."""
+    import trinity_dynamics.simulation as simulation
+    from trinity_dynamics.store import load_trajectory
+    monkeypatch.setattr(simulation, "NOISE_BLOCK", 30)  # 10-step noise blocks exercise block rewinds
+    ref = sim.run_simulation(DEFAULT_X0, DEFAULT_A, s_factor=1.0, steps=200, seed=6)
+
+    drift, calls = simulation.replicator_drift, []
+    def flaky(*args):
+        calls.append(1)
+        if len(calls) == 123:
+            raise RuntimeError("node lost")
+        return drift(*args)
+    monkeypatch.setattr(simulation, "replicator_drift", flaky)
+    path = str(tmp_path / "run.npy")
+    assert sim.run_simulation(DEFAULT_X0, DEFAULT_A, s_factor=1.0, steps=200, seed=6,
+                              store=path, checkpoint_every=7) is None
+
+    monkeypatch.setattr(simulation, "replicator_drift", drift)
+    x = sim.run_simulation(DEFAULT_X0, DEFAULT_A, s_factor=1.0, steps=200, seed=6, store=path, checkpoint_every=7)
+    assert sim.last_run["resumed_from"] == 119
+    np.testing.assert_array_equal(x, ref)
+    np.testing.assert_array_equal(load_trajectory(path), ref)
+    with pytest.raises(ValueError):
+        sim.run_simulation(DEFAULT_X0, DEFAULT_A, s_factor=1.01, steps=200, seed=6, store=path)
+
+def test_store_resumes_early_exit_run(sim, tmp_path, monkeypatch):
+    """An early-exit stored run checkpoints, resumes to the same stop, and is not reused without tol."""
+    import trinity_dynamics.simulation as simulation
+    ref = sim.run_simulation(X0_LIST[1], DEFAULT_A, s_factor=1.0, steps=2000, seed=42, tol=1e-4)
+    stop = sim.last_run["stop_step"]
+    assert stop is not None
+
+    drift, calls = simulation.replicator_drift, []
+    def flaky(*args):
+        calls.append(1)
+        if len(calls) == stop // 2:
+            raise RuntimeError("node lost")
+        return drift(*args)
+    monkeypatch.setattr(simulation, "replicator_drift", flaky)
+    path = str(tmp_path / "run.npy")
+    kwargs = dict(s_factor=1.0, steps=2000, seed=42, store=path, checkpoint_every=50)
+    assert sim.run_simulation(X0_LIST[1], DEFAULT_A, tol=1e-4, **kwargs) is None
+
+    monkeypatch.setattr(simulation, "replicator_drift", drift)
+    x = sim.run_simulation(X0_LIST[1], DEFAULT_A, tol=1e-4, **kwargs)
+    assert sim.last_run["resumed_from"] > 0 and sim.last_run["stop_step"] == stop
+    np.testing.assert_array_equal(x, ref)
+    assert sim.run_simulation(X0_LIST[1], DEFAULT_A, tol=1e-4, **kwargs).shape == ref.shape
+    with pytest.raises(ValueError):
+        sim.run_simulation(X0_LIST[1], DEFAULT_A, **kwargs)
+
+def test_equilibrium_solver_classifies_fixed_points():
+    """Support enumeration finds the stable interior point of an anti-coordination game."""
+    from trinity_dynamics.simulation import find_equilibria, steady_state
+    A = np.array([[0.0, 3.0], [1.0, 2.0]])
+    eq = {e["support"]: e for e in find_equilibria(A)}
+    assert set(eq) == {(0,), (1,), (0, 1)}
+    np.testing.assert_allclose(eq[(0, 1)]["state"], [0.5, 0.5])
+    assert eq[(0, 1)]["stable"] and not eq[(0,)]["stable"] and not eq[(1,)]["stable"]
+    np.testing.assert_allclose(steady_state(A)["state"], [0.5, 0.5])
+
+def test_steady_state_sweep_matches_long_simulation(sim):
+    """With several attractors, the basin of x0 decides the steady state a long run reaches."""
+    from trinity_dynamics.simulation import steady_state
+    for x0 in X0_LIST[:2]:
+        eq = steady_state(A_LIST[0], 1.0, x0)
+        x = sim.run_simulation(x0, A_LIST[0], s_factor=1.0, steps=20000, seed=1, record="none")
+        np.testing.assert_allclose(x[-1], eq["state"], atol=5e-3)
+
+
+def test_steady_state_sweep_only_answers_runs_settled_by_the_horizon():
+    """Grid points whose flow arrives within steps * dt take the equilibrium; the rest are simulated."""
+    grid = param_grid(x0_list=X0_LIST, a_list=A_LIST, dt_list=DT_LIST, s_list=[1.0], seeds=[42])
+    full = run_sensitivity(steps=2000, grid=grid)
+    fast = run_sensitivity(steps=2000, grid=grid, steady_state=True)
+    eq = (fast["solver"] == "equilibrium").values
+    assert 0 < eq.sum() < len(grid) and fast.loc[eq, "conv_time"].isna().all()
+    np.testing.assert_allclose(fast.loc[eq, "entropy"], full.loc[eq, "entropy"], atol=0.02)
+    np.testing.assert_array_equal(fast.loc[~eq, "entropy"], full.loc[~eq, "entropy"])
+    short = run_sensitivity(steps=200, grid=grid[:4], steady_state=True)
+    assert (short["solver"] == "simulation").all()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+tests/test_trinity_visualize.py — Downsampled trajectory plots
+"""
+
+import threading
+import numpy as np
+import pytest
+
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from trinity_dynamics.visualize import minmax_indices, lttb_indices, plot_trajectories_matplotlib
+
+def test_decimation_keeps_extremes_and_endpoints():
+    """Min-max buckets keep every bucket's extremes; LTTB keeps n_out ordered points including both ends."""
+    y = np.random.default_rng(0).normal(size=100_001)
+    idx = minmax_indices(y, 100)
+    assert len(idx) <= 202 and idx[0] == 0 and idx[-1] == len(y) - 1
+    assert y[idx].max() == y.max() and y[idx].min() == y.min()
+    np.testing.assert_array_equal(minmax_indices(y[:150], 100), np.arange(150))
+
+    t = np.linspace(0, 20 * np.pi, 50_000)
+    pts = np.column_stack([np.cos(t), np.sin(t)])
+    keep = lttb_indices(pts, 400)
+    assert len(keep) == 400 and keep[0] == 0 and keep[-1] == len(pts) - 1 and np.all(np.diff(keep) > 0)
+    # The decimated curve still traces the whole circle
+    assert np.abs(pts[keep]).max(axis=0) == pytest.approx([1.0, 1.0], abs=1e-3)
+
+def test_long_many_agent_plot_is_resolution_bounded(tmp_path):
+    """A long 20-agent run is drawn as two LineCollections whose size depends on pixels, not samples."""
+    x = np.abs(np.random.default_rng(1).normal(size=(200_000, 20))).cumsum(axis=0)
+    x /= x.sum(axis=1, keepdims=True)
+    out = tmp_path / "cmp.png"
+    fig = plot_trajectories_matplotlib(x, x, out_png=str(out))
+    assert out.stat().st_size > 0
+    ax = fig.axes[0]
+    collections = [c for c in ax.collections if isinstance(c, LineCollection)]
+    assert len(collections) == 2 and len(collections[0].get_segments()) == 20
+    assert max(len(seg) for c in collections for seg in c.get_segments()) < 5000
+    assert all(len(line.get_xdata()) < 5000 for a in fig.axes for line in a.get_lines())
+
+def test_plot_from_a_worker_thread_leaves_pyplot_alone(tmp_path):
+    """The comparison plot can be drawn off the main thread and registers no pyplot figure."""
+    x = np.abs(np.random.default_rng(2).normal(size=(500, 3))).cumsum(axis=0)
+    x /= x.sum(axis=1, keepdims=True)
+    before = plt.get_fignums()
+    out = tmp_path / "cmp.png"
+    worker = threading.Thread(target=plot_trajectories_matplotlib, args=(x, x), kwargs={"out_png": str(out)})
+    worker.start()
+    worker.join()
+    assert out.stat().st_size > 0 and plt.get_fignums() == before
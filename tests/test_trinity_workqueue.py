@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+tests/test_trinity_workqueue.py — Shared SQLite work queue for multi-host sweeps
+"""
+
+import pandas as pd
+from trinity_dynamics.config import X0_LIST, A_LIST
+from trinity_dynamics.sensitivity import param_grid, run_sensitivity
+from trinity_dynamics.workqueue import WorkQueue
+
+def test_queued_sweep_matches_serial_and_retries_expired_leases(tmp_path, monkeypatch):
+    """A worker that dies holding a lease only delays its task; rows equal the serial sweep."""
+    grid = param_grid(x0_list=X0_LIST[:2], a_list=A_LIST[:2], dt_list=[0.01], s_list=[1.0, 1.01], seeds=[42])
+    serial = run_sensitivity(steps=200, grid=grid)
+    path = str(tmp_path / "queue.db")
+
+    from trinity_dynamics import workqueue
+    real_worker = workqueue.run_worker
+    def crash_then_work(queue, handler, **kwargs):
+        q = WorkQueue(queue)
+        assert q.claim("dead-node", lease=0.0) is not None  # Claimed, never finished
+        q.close()
+        return real_worker(queue, handler, **kwargs)
+    monkeypatch.setattr(workqueue, "run_worker", crash_then_work)
+    queued = run_sensitivity(steps=200, grid=grid, queue=path, chunk_size=3)
+    pd.testing.assert_frame_equal(queued, serial)
+
+    q = WorkQueue(path)
+    assert q.counts() == {"done": 3}
+    assert q.conn.execute("SELECT MAX(attempts) FROM tasks").fetchone()[0] == 2
+    q.close()
@@ -5,10 +5,43 @@ Date: 2025-10-01
 License: CC BY 4.0
 Signature: κ/π ≈ 1.01 stabilization principle
 Description: Package initializer, rooted in Shinati-Itanihs and (Luke 17:21)'s inner truth.
+             Public names load on first access (PEP 562), so importing the package stays
+             cheap and free of side effects; e.g. TrinitySimulation never pulls in pandas,
+             plotting or reporting.
 """
-from .simulation import TrinitySimulation
-from .metrics import compute_metrics
-from .sensitivity import run_sensitivity
-from .visualize import plot_trajectories_matplotlib, plot_dashboard_plotly
-from .report import generate_report
-from .main import main
\ No newline at end of file
+import importlib
+import sys
+import types
+
+_EXPORTS = {
+    "TrinitySimulation": "simulation",
+    "compute_metrics": "metrics",
+    "run_sensitivity": "sensitivity",
+    "plot_trajectories_matplotlib": "visualize",
+    "plot_dashboard_plotly": "visualize",
+    "generate_report": "report",
+    "main": "main",
+}
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+class _Package(types.ModuleType):
+    """Keeps trinity_dynamics.main the entry-point function, whoever imports the main submodule first."""
+
+    def __setattr__(self, name, value):
+        # The import system binds a freshly imported submodule to its package attribute
+        if name == "main" and isinstance(value, types.ModuleType):
+            value = value.main
+        super().__setattr__(name, value)
+
+sys.modules[__name__].__class__ = _Package
@@ -0,0 +1,154 @@
+"""
+Trinity Dynamics Simulation Framework
+Author: John Carroll Jr. (Two Mile Solutions LLC, Alaska)
+Date: 2025-10-01
+License: CC BY 4.0
+Signature: κ/π ≈ 1.01 stabilization principle
+Description: Online aggregation of sweep results across seeds: running mean/variance,
+             min/max, P² quantile sketches and confidence bands per scenario.
+"""
+
+import numpy as np
+import pandas as pd
+from .columnar import METRIC_COLUMNS, scenario_id
+
+QUANTILES = (0.05, 0.5, 0.95)
+EXACT_LIMIT = 64  # Observations kept exactly before a quantile sketch switches to P²
+Z95 = 1.96
+
+class P2Quantile:
+    """
+    Streaming p-quantile in O(1) memory (Jain & Chlamtac's P² algorithm). The first
+    EXACT_LIMIT observations are kept and give exact quantiles; the five P² markers
+    are then seeded from them at their desired ranks.
+    """
+
+    def __init__(self, p):
+        self.p = p
+        self.buf = []
+        self.q = self.n = self.want = None
+        self.dn = np.array([0.0, p / 2, p, (1 + p) / 2, 1.0])
+
+    def add(self, x):
+        if self.q is None:
+            self.buf.append(x)
+            if len(self.buf) > EXACT_LIMIT:
+                self._seed()
+            return
+        q, n = self.q, self.n
+        if x < q[0]:
+            q[0], k = x, 0
+        elif x >= q[4]:
+            q[4], k = x, 3
+        else:
+            k = int(np.searchsorted(q, x, side="right")) - 1
+        n[k + 1:] += 1
+        self.want += self.dn
+        for i in (1, 2, 3):
+            d = self.want[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1.0 if d > 0 else -1.0
+                qp = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+                    (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < qp < q[i + 1]:
+                    j = i + int(d)
+                    qp = q[i] + d * (q[j] - q[i]) / (n[j] - n[i])
+                q[i] = qp
+                n[i] += d
+
+    def _seed(self):
+        xs = np.sort(self.buf)
+        last = len(xs) - 1
+        self.want = self.dn * last
+        ranks = np.round(self.want).astype(int)
+        for i in range(1, 5):
+            ranks[i] = max(ranks[i], ranks[i - 1] + 1)
+        for i in range(3, -1, -1):
+            ranks[i] = min(ranks[i], ranks[i + 1] - 1)
+        self.n = ranks.astype(float)
+        self.q = xs[ranks].astype(float)
+        self.buf = None
+
+    def value(self):
+        if self.q is None:
+            return float(np.quantile(self.buf, self.p)) if self.buf else float("nan")
+        return float(self.q[2])
+
+class RunningStats:
+    """Count, Welford mean/variance, min/max and quantile sketches of the finite values seen."""
+
+    def __init__(self, quantiles=QUANTILES):
+        self.n = self.nonfinite = 0
+        self.mean = self.m2 = 0.0
+        self.min, self.max = float("inf"), float("-inf")
+        self.sketches = [P2Quantile(p) for p in quantiles]
+
+    def add(self, x):
+        x = float(x)
+        if not np.isfinite(x):
+            self.nonfinite += 1
+            return
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+        self.min, self.max = min(self.min, x), max(self.max, x)
+        for sk in self.sketches:
+            sk.add(x)
+
+    def summary(self, prefix):
+        """Flat dict of statistics, column names prefixed with the metric."""
+        nan = float("nan")
+        std = np.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else nan
+        sem = std / np.sqrt(self.n) if self.n > 1 else nan
+        mean = self.mean if self.n else nan
+        out = {f"{prefix}_mean": mean, f"{prefix}_std": std,
+               f"{prefix}_ci_lo": mean - Z95 * sem, f"{prefix}_ci_hi": mean + Z95 * sem,
+               f"{prefix}_min": self.min if self.n else nan, f"{prefix}_max": self.max if self.n else nan,
+               f"{prefix}_nonfinite": self.nonfinite}
+        for sk in self.sketches:
+            out[f"{prefix}_q{round(100 * sk.p):02d}"] = sk.value()
+        return out
+
+class ScenarioAggregator:
+    """
+    Folds results into per-scenario statistics as they arrive: one entry per
+    (x0, A, dt, s), whatever the number of seeds. Memory is bounded by the number of
+    scenarios, not of runs.
+    """
+
+    def __init__(self, metrics=METRIC_COLUMNS, quantiles=QUANTILES):
+        self.metrics = metrics
+        self.quantiles = quantiles
+        self.groups = {}
+
+    def add(self, p, m):
+        """Adds one grid point's metrics (None for a failed run is skipped)."""
+        if m is None:
+            return
+        key = (scenario_id(p["x0"], p["A"]), p["dt"], p["s"])
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = {
+                "params": {"scenario": key[0], "dt": p["dt"], "s": p["s"], "x0": tuple(p["x0"].round(3)),
+                           "A_tag": tuple(p["A"].round(3).flatten())},
+                "runs": 0, "stats": {k: RunningStats(self.quantiles) for k in self.metrics}}
+        group["runs"] += 1
+        for k, st in group["stats"].items():
+            st.add(m[k])
+
+    def result(self):
+        """
+        Returns:
+            pd.DataFrame: One row per scenario: parameters, run count and, per metric, mean,
+                          std, 95% confidence band on the mean, min/max, quantiles and the
+                          number of non-finite values
+        """
+        rows = []
+        for g in self.groups.values():
+            row = {**g["params"], "runs": g["runs"]}
+            for k, st in g["stats"].items():
+                row.update(st.summary(k))
+            rows.append(row)
+        return pd.DataFrame(rows)
@@ -0,0 +1,219 @@
+"""
+Trinity Dynamics Simulation Framework
+Author: John Carroll Jr. (Two Mile Solutions LLC, Alaska)
+Date: 2025-10-01
+License: CC BY 4.0
+Signature: κ/π ≈ 1.01 stabilization principle
+Description: Benchmark suite for simulation, metrics, sweeps and the main pipeline, with
+             JSON results carrying machine metadata and a comparison that flags slowdowns.
+             Run with: python -m trinity_dynamics.benchmarks run -o bench.json
+             Compare:  python -m trinity_dynamics.benchmarks compare base.json bench.json
+"""
+
+import argparse
+import contextlib
+import datetime
+import importlib
+import io
+import json
+import os
+import platform
+import socket
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+import numpy as np
+
+REPEATS = 5
+THRESHOLD = 0.10  # Relative slowdown of the median time flagged by compare
+
+def _simulation(n_agents, steps):
+    from .simulation import TrinitySimulation
+
+    sim = TrinitySimulation(n_agents=n_agents)
+    rng = np.random.default_rng(0)
+    x0 = rng.dirichlet(np.ones(n_agents))
+    A = rng.uniform(0.2, 0.8, (n_agents, n_agents))
+    return lambda: sim.run_simulation(x0, A, s_factor=1.01, dt=0.01, steps=steps, seed=1)
+
+def _metrics(length):
+    from .simulation import TrinitySimulation
+    from .metrics import compute_metrics
+    from .config import DEFAULT_X0, DEFAULT_A
+
+    x = TrinitySimulation(n_agents=3).run_simulation(DEFAULT_X0, DEFAULT_A, s_factor=1.01, dt=0.01, steps=length,
+                                                     seed=1)
+    compute_metrics(x, 0.01)  # Pays the one-off scipy.signal import outside the timing
+    return lambda: compute_metrics(x, 0.01)
+
+def _reduced_grid():
+    from .config import X0_LIST, A_LIST, DT_LIST, S_LIST, SEEDS
+    from .sensitivity import param_grid
+
+    return param_grid(x0_list=X0_LIST[:2], a_list=A_LIST[:2], dt_list=DT_LIST[:2], s_list=S_LIST[:2],
+                      seeds=SEEDS[:2])
+
+def _sweep(batch_size):
+    from .sensitivity import run_sensitivity
+
+    grid = _reduced_grid()
+    return lambda: run_sensitivity(steps=1000, grid=grid, batch_size=batch_size)
+
+class _StubFigure:
+    def write_html(self, path, **kwargs):
+        open(path, "w").close()
+
+def _stub_png(x_without, x_with, dt=None, out_png=None):
+    """Writes a 1x1 PNG, so the report still embeds an image."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    with open(out_png, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 0, 0, 0, 0)) +
+                chunk(b"IDAT", zlib.compress(b"\x00\xff")) + chunk(b"IEND", b""))
+
+def _pipeline():
+    """main() on the reduced grid in a fresh data directory, plotting replaced by stubs writing placeholder files."""
+    from .sensitivity import run_sensitivity
+
+    main_mod = importlib.import_module(".main", __package__)
+    grid = _reduced_grid()
+    stubs = {"plot_trajectories_matplotlib": _stub_png, "plot_dashboard_plotly": lambda df: _StubFigure(),
+             "run_sensitivity": lambda **kw: run_sensitivity(**{**kw, "grid": grid, "progress": None})}
+
+    def run():
+        saved = {k: getattr(main_mod, k) for k in (*stubs, "DATA_DIR")}
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                for k, v in {**stubs, "DATA_DIR": tmp}.items():
+                    setattr(main_mod, k, v)
+                status = main_mod.main()
+            finally:
+                for k, v in saved.items():
+                    setattr(main_mod, k, v)
+        if set(status.values()) != {"ran"}:
+            raise RuntimeError(f"pipeline stages did not all run: {status}")
+    return run
+
+# name -> setup; a setup returns the zero-argument callable that is timed
+BENCHMARKS = {
+    **{f"simulate[n={n},steps={steps}]": (lambda n=n, steps=steps: _simulation(n, steps))
+       for n, steps in ((3, 2000), (3, 20000), (10, 2000), (50, 2000))},
+    **{f"compute_metrics[len={length}]": (lambda length=length: _metrics(length))
+       for length in (1000, 10000, 100000)},
+    "sweep[reduced,serial]": lambda: _sweep(None),
+    "sweep[reduced,batched]": lambda: _sweep(256),
+    "pipeline[main,stubbed plots]": _pipeline,
+}
+
+def machine_metadata():
+    """Where and on what the benchmarks ran."""
+    meta = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "host": socket.gethostname(), "platform": platform.platform(), "machine": platform.machine(),
+        "processor": platform.processor(), "cpu_count": os.cpu_count(), "python": platform.python_version(),
+    }
+    for name in ("numpy", "scipy", "pandas"):
+        try:
+            meta[name] = importlib.import_module(name).__version__
+        except ImportError:
+            meta[name] = None
+    try:
+        meta["commit"] = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                                        cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        meta["commit"] = None
+    return meta
+
+def run_benchmarks(names=None, repeats=REPEATS, out=None):
+    """
+    Times each benchmark: one untimed warm-up call, then repeats timed calls.
+    Args:
+        names (list, optional): Benchmarks to run; entries may be substrings of names
+        repeats (int): Timed calls per benchmark
+        out (str, optional): Write the results JSON here
+    Returns:
+        dict: {"machine": metadata, "repeats": repeats, "results": {name: stats in seconds}}
+    Raises:
+        ValueError: If no benchmark matches names
+    """
+    selected = [b for b in BENCHMARKS if not names or any(n in b for n in names)]
+    if not selected:
+        raise ValueError(f"No benchmark matches {names}; available: {list(BENCHMARKS)}")
+    results = {}
+    for name in selected:
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn = BENCHMARKS[name]()
+            fn()
+            times = []
+            for _ in range(repeats):
+                t0 = time.perf_counter()
+                fn()
+                times.append(time.perf_counter() - t0)
+        results[name] = {"median": statistics.median(times), "min": min(times), "mean": statistics.fmean(times),
+                         "stdev": statistics.stdev(times) if len(times) > 1 else 0.0, "times": times}
+        print(f"{name:34s} median {results[name]['median'] * 1e3:10.2f} ms  min {results[name]['min'] * 1e3:10.2f} ms")
+    report = {"machine": machine_metadata(), "repeats": repeats, "results": results}
+    if out:
+        with open(out, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+def compare(base, new, threshold=THRESHOLD):
+    """
+    Compares median times of two result sets (dicts or JSON paths).
+    Returns:
+        list: One dict per shared benchmark with base, new, ratio and slower (ratio > 1 + threshold)
+    """
+    if isinstance(base, str):
+        with open(base) as f:
+            base = json.load(f)
+    if isinstance(new, str):
+        with open(new) as f:
+            new = json.load(f)
+    rows = []
+    for name, b in base["results"].items():
+        n = new["results"].get(name)
+        if n is None:
+            continue
+        ratio = n["median"] / b["median"] if b["median"] > 0 else float("inf")
+        rows.append({"name": name, "base": b["median"], "new": n["median"], "ratio": ratio,
+                     "slower": ratio > 1 + threshold})
+    return rows
+
+def main(argv=None):
+    """Command line: run the suite, or compare two result files (exit status 1 on slowdowns)."""
+    parser = argparse.ArgumentParser(description="Trinity Dynamics benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="Run benchmarks and write JSON results")
+    run.add_argument("-o", "--out", default="bench.json", help="Results file")
+    run.add_argument("-k", "--select", action="append", help="Only benchmarks whose name contains this")
+    run.add_argument("-r", "--repeats", type=int, default=REPEATS, help="Timed calls per benchmark")
+    run.add_argument("--list", action="store_true", help="List benchmark names and exit")
+    cmp = sub.add_parser("compare", help="Flag benchmarks whose median slowed down beyond a threshold")
+    cmp.add_argument("base", help="Baseline results file")
+    cmp.add_argument("new", help="New results file")
+    cmp.add_argument("-t", "--threshold", type=float, default=THRESHOLD, help="Relative slowdown tolerated")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        if args.list:
+            print("\n".join(BENCHMARKS))
+            return 0
+        run_benchmarks(args.select, args.repeats, args.out)
+        print(f"Benchmark results saved: {args.out}")
+        return 0
+    rows = compare(args.base, args.new, args.threshold)
+    for r in rows:
+        flag = "SLOWER" if r["slower"] else ""
+        print(f"{r['name']:34s} {r['base'] * 1e3:10.2f} ms -> {r['new'] * 1e3:10.2f} ms  x{r['ratio']:.2f} {flag}")
+    slower = [r["name"] for r in rows if r["slower"]]
+    if slower:
+        print(f"{len(slower)} benchmark(s) slower than {1 + args.threshold:.2f}x baseline")
+    return 1 if slower else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
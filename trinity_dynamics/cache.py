@@ -0,0 +1,136 @@
+"""
+Trinity Dynamics Simulation Framework
+Author: John Carroll Jr. (Two Mile Solutions LLC, Alaska)
+Date: 2025-10-01
+License: CC BY 4.0
+Signature: κ/π ≈ 1.01 stabilization principle
+Description: Content-addressed on-disk cache of run results, keyed by everything that
+             determines a run, so repeated sweeps only simulate new grid points.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import numpy as np
+from .config import NOISE_LEVEL, CONV_THRESHOLD
+from .store import run_fingerprint, _write_json
+
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 256 * 2**20
+# Modules whose source decides a run's results; editing any of them invalidates the cache.
+# config is left out on purpose: the values in it that change a run are part of result_key,
+# so growing a sweep list keeps the existing entries
+CODE_MODULES = ("simulation", "integrators", "recording", "metrics")
+
+def source_hash(modules, salt=""):
+    """Hash of the source files of the given package modules (names without .py)."""
+    h = hashlib.sha256(salt.encode())
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in modules:
+        with open(os.path.join(here, name + ".py"), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+@functools.lru_cache(maxsize=None)
+def code_version():
+    """Hash of the result-determining source files."""
+    return source_hash(CODE_MODULES, str(CACHE_VERSION))
+
+def result_key(x0, A, dt, s_factor, seed, steps, **options):
+    """
+    Stable key of one run: its inputs, the noise level and convergence threshold, run
+    options and the code version.
+    Args:
+        options: Anything else that changes the result (method, tol, ...)
+    Returns:
+        str: Hex digest
+    """
+    h = hashlib.sha256(run_fingerprint(x0, A, s_factor, dt, steps, seed).encode())
+    h.update(repr((NOISE_LEVEL, CONV_THRESHOLD, sorted(options.items()))).encode())
+    h.update(code_version().encode())
+    return h.hexdigest()
+
+def metrics_to_json(m):
+    """JSON-ready copy of a metrics dict (final_state as a list)."""
+    fs = m.get("final_state")
+    return {**m, "final_state": None if fs is None else np.asarray(fs).tolist()}
+
+def metrics_from_json(m):
+    """Inverse of metrics_to_json."""
+    if m.get("final_state") is not None:
+        m["final_state"] = np.array(m["final_state"])
+    return m
+
+class ResultCache:
+    """
+    Directory of metrics (<key>.json) and, optionally, trajectories (<key>.npy), sharded
+    by key prefix. Reads refresh an entry's mtime; evict() drops the least recently used
+    entries until the cache fits in max_bytes.
+    """
+
+    def __init__(self, root, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def _path(self, key, ext):
+        return os.path.join(self.root, key[:2], key + ext)
+
+    def get(self, key, trajectory=False):
+        """
+        Looks up a run.
+        Args:
+            key (str): result_key of the run
+            trajectory (bool): Also require and load the stored trajectory
+        Returns:
+            dict or (dict, np.array) or None: Metrics (and trajectory), None on a miss
+        """
+        path = self._path(key, ".json")
+        try:
+            with open(path) as f:
+                m = json.load(f)
+            x = np.load(self._path(key, ".npy")) if trajectory else None
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass  # Read-only or shared cache: the hit stands, only its LRU age is not refreshed
+        m = metrics_from_json(m)
+        return (m, x) if trajectory else m
+
+    def put(self, key, metrics, x=None):
+        """Stores a run's metrics dict and, if given, its trajectory."""
+        os.makedirs(os.path.join(self.root, key[:2]), exist_ok=True)
+        if x is not None:
+            tmp = self._path(key, ".tmp.npy")
+            np.save(tmp, x)
+            os.replace(tmp, self._path(key, ".npy"))
+        _write_json(self._path(key, ".json"), metrics_to_json(metrics))
+
+    def evict(self):
+        """Removes least recently used entries until the cache is within max_bytes."""
+        entries, total = [], 0
+        if not os.path.isdir(self.root):
+            return
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+            for e in os.scandir(shard.path):
+                if e.name.endswith(".json"):
+                    key = e.name[:-5]
+                    size = e.stat().st_size
+                    npy = self._path(key, ".npy")
+                    if os.path.exists(npy):
+                        size += os.path.getsize(npy)
+                    entries.append((e.stat().st_mtime, key, size))
+                    total += size
+        for _, key, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for ext in (".json", ".npy"):
+                try:
+                    os.remove(self._path(key, ext))
+                except FileNotFoundError:
+                    pass
+            total -= size
@@ -0,0 +1,100 @@
+"""
+Trinity Dynamics Simulation Framework
+Author: John Carroll Jr. (Two Mile Solutions LLC, Alaska)
+Date: 2025-10-01
+License: CC BY 4.0
+Signature: κ/π ≈ 1.01 stabilization principle
+Description: Streaming Parquet output for sensitivity sweeps: one row group per finished
+             chunk, x0/A as fixed-width float columns and a dictionary-encoded scenario id.
+"""
+
+import hashlib
+import numpy as np
+
+METRIC_COLUMNS = ("conv_time", "entropy", "osc_freq", "stability", "energy")
+
+def scenario_id(x0, A):
+    """Short stable id of an (x0, A) pair, shared by every dt/s/seed run of that scenario."""
+    h = hashlib.sha1(np.ascontiguousarray(x0, dtype=float).tobytes())
+    h.update(np.ascontiguousarray(A, dtype=float).tobytes())
+    return h.hexdigest()[:12]
+
+def param_columns(n_agents):
+    """Names of the fixed-width parameter columns: x0_i and A_i_j."""
+    return ([f"x0_{i}" for i in range(n_agents)] +
+            [f"A_{i}_{j}" for i in range(n_agents) for j in range(n_agents)])
+
+class SweepWriter:
+    """
+    Appends sweep results to a Parquet file one row group at a time, so a sweep never
+    holds more than a chunk of rows. Use as a context manager or call close().
+    """
+
+    def __init__(self, path, n_agents=3):
+        self.path = path
+        self.n_agents = n_agents
+        self.writer = None
+        self.rows = 0
+
+    def _table(self, points, metrics):
+        import pyarrow as pa
+
+        keep = [(p, m) for p, m in zip(points, metrics) if m is not None]
+        n = self.n_agents
+        x0 = np.array([p["x0"] for p, _ in keep], dtype=float).reshape(-1, n)
+        A = np.array([p["A"] for p, _ in keep], dtype=float).reshape(-1, n * n)
+        cols = {
+            "scenario": pa.array([scenario_id(p["x0"], p["A"]) for p, _ in keep]).dictionary_encode(),
+            "dt": pa.array([p["dt"] for p, _ in keep], pa.float64()),
+            "s": pa.array([p["s"] for p, _ in keep], pa.float64()),
+            "seed": pa.array([p["seed"] for p, _ in keep], pa.int64()),
+        }
+        for k, name in enumerate(param_columns(n)):
+            cols[name] = pa.array(x0[:, k] if k < n else A[:, k - n])
+        for name in METRIC_COLUMNS:
+            cols[name] = pa.array([m[name] for _, m in keep], pa.float64())
+        if keep and "solver" in keep[0][1]:
+            cols["solver"] = pa.array([m["solver"] for _, m in keep]).dictionary_encode()
+        if keep and "source" in keep[0][1]:
+            cols["source"] = pa.array([m["source"] for _, m in keep]).dictionary_encode()
+            for name in [k for k in keep[0][1] if k.endswith("_sd")]:
+                cols[name] = pa.array([m[name] for _, m in keep], pa.float64())
+        return pa.table(cols)
+
+    def write(self, points, metrics):
+        """Writes one chunk (grid points and their metrics; failed runs are skipped) as a row group."""
+        import pyarrow.parquet as pq
+
+        table = self._table(points, metrics)
+        if table.num_rows == 0:
+            return
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+        self.rows += table.num_rows
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def read_sweep(path, columns=None, filters=None):
+    """
+    Reads sweep results back, optionally only some columns and rows.
+    Args:
+        path (str): Parquet file written by SweepWriter
+        columns (list, optional): Columns to load
+        filters (list, optional): Row filters such as [("s", "==", 1.01), ("dt", "<", 0.02)];
+                                  non-matching row groups are skipped without decoding
+    Returns:
+        pd.DataFrame: Matching rows, scenario (and solver) as categoricals
+    """
+    import pyarrow.parquet as pq
+
+    return pq.read_table(path, columns=columns, filters=filters).to_pandas()
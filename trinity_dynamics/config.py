@@ -19,6 +19,8 @@ STEPS = 2000  # Number of time steps
 DT_BASE = 0.01  # Base time step
 SEED = 42  # Random seed for reproducibility
 NOISE_LEVEL = 0.001  # Noise injection for realism
+CONV_THRESHOLD = 1e-4  # Step size below which a trajectory counts as converged
+CONV_HOLD = 100  # Minimum steps the early-exit settled window spans (widened to the metrics tail)
 
 # Default Initial Conditions and Interaction Matrix
 DEFAULT_X0 = np.array([0.33, 0.33, 0.34])  # Near-equal starting proportions
@@ -41,4 +43,8 @@ A_LIST = [
 ]
 DT_LIST = [0.01, 0.005, 0.02, 0.015]  # Expanded
 S_LIST = [1.0, 1.005, 1.01, 1.015, S_FACTOR, 1.02]  # Extended
-SEEDS = [SEED + i for i in range(5)]  # Multiple seeds
\ No newline at end of file
+SEEDS = [SEED + i for i in range(5)]  # Multiple seeds
+
+# Continuous ranges for quasi-random sampling (sampling.py); x0 covers the whole simplex
+# and A keeps a unit diagonal with symmetric off-diagonal entries drawn from its range
+SAMPLE_BOUNDS = {"A": (0.2, 0.8), "dt": (0.005, 0.02), "s": (1.0, 1.02)}
\ No newline at end of file
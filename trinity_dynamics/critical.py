@@ -0,0 +1,132 @@
+"""
+Trinity Dynamics Simulation Framework
+Author: John Carroll Jr. (Two Mile Solutions LLC, Alaska)
+Date: 2025-10-01
+License: CC BY 4.0
+Signature: κ/π ≈ 1.01 stabilization principle
+Description: Critical-s search: bracketing plus bisection (thresholds) or golden-section
+             search (minima) on seed-averaged metrics, in tens of simulations.
+"""
+
+import numpy as np
+import pandas as pd
+from .config import DEFAULT_X0, DEFAULT_A, DT_BASE, STEPS, SEEDS
+from .metrics import compute_metrics_batch
+from .simulation import TrinitySimulation
+
+Z95 = 1.96
+GOLDEN = (np.sqrt(5) - 1) / 2
+
+def _prober(sim, metric, x0, A, dt, steps, seeds):
+    """Returns probe(s) -> (mean, standard error, finite fraction) of the metric over seeds."""
+    probes = []
+
+    def probe(s):
+        B = len(seeds)
+        x = sim.run_ensemble(np.tile(x0, (B, 1)), A, s_factor=s, dt=dt, steps=steps, seeds=seeds)
+        v = compute_metrics_batch(x, dt)[metric]
+        finite = np.isfinite(v)
+        mean = float(np.mean(v))
+        sem = float(np.std(v[finite], ddof=1) / np.sqrt(finite.sum())) if finite.sum() > 1 else 0.0
+        probes.append({"s": float(s), "mean": mean, "sem": sem, "finite": float(finite.mean())})
+        return probes[-1]
+    return probe, probes
+
+def find_critical_s(metric="conv_time", mode="threshold", level=None, s_range=(0.9, 1.1), x0=DEFAULT_X0,
+                    A=DEFAULT_A, dt=DT_BASE, steps=STEPS, seeds=None, xtol=1e-3, n_bracket=4, n_agents=3):
+    """
+    Locates where s changes a metric's behaviour.
+    Args:
+        metric (str): compute_metrics key, e.g. "conv_time", "osc_freq" or "stability"
+        mode (str): "threshold" (s where the seed-averaged metric crosses level) or
+                    "minimum" (s minimising it)
+        level (float, optional): Threshold; default is convergence flipping when the metric
+                                 is non-finite at one end of the range (half the seeds
+                                 finite), else halfway between the values at the ends
+        s_range (tuple): Search interval
+        x0, A, dt, steps: Scenario
+        seeds (list, optional): Seeds averaged within every probe (default: config.SEEDS)
+        xtol (float): Width in s at which the search stops
+        n_bracket (int): Interior probes used to find a sign change when the ends agree
+        n_agents (int): Number of agents
+    Returns:
+        dict: "s" estimate, 95% "ci" (lo, hi), "simulations" run, "found" flag, "level"
+              and the "probes" DataFrame (s, mean, sem, finite)
+    Raises:
+        ValueError: If mode is unknown
+    """
+    seeds = list(seeds or SEEDS)
+    sim = TrinitySimulation(n_agents=n_agents)
+    probe, probes = _prober(sim, metric, x0, A, dt, steps, seeds)
+    lo, hi = map(float, s_range)
+    if mode == "threshold":
+        result = _bisect(probe, lo, hi, level, xtol, n_bracket)
+    elif mode == "minimum":
+        result = _golden(probe, lo, hi, xtol)
+    else:
+        raise ValueError(f"Unknown mode {mode!r}; expected 'threshold' or 'minimum'")
+    return {**result, "simulations": len(probes) * len(seeds), "probes": pd.DataFrame(probes)}
+
+def _bisect(probe, lo, hi, level, xtol, n_bracket):
+    """Bracketing then bisection on the side of level each probe falls on."""
+    ends = [probe(lo), probe(hi)]
+    if level is None and any(p["finite"] < 1 for p in ends):
+        # Convergence flips: split on whether most seeds give a finite metric
+        level = "finite"
+        above = lambda p: p["finite"] < 0.5
+        sure = lambda p: abs(p["finite"] - 0.5) >= 0.25
+    else:
+        if level is None:
+            level = (ends[0]["mean"] + ends[1]["mean"]) / 2
+        above = lambda p: p["mean"] > level
+        # A probe whose mean sits within its own noise of the level could fall either way
+        sure = lambda p: abs(p["mean"] - level) > Z95 * p["sem"]
+
+    side_lo = above(ends[0])
+    points = [(lo, ends[0]), (hi, ends[1])]
+    if above(ends[1]) == side_lo:
+        # Ends agree: look inside for a sign change
+        for s in np.linspace(lo, hi, n_bracket + 2)[1:-1]:
+            p = probe(s)
+            points.append((s, p))
+            if above(p) != side_lo:
+                hi = s
+                break
+            lo = s
+        else:
+            return {"s": float("nan"), "ci": (float("nan"), float("nan")), "found": False, "level": level}
+    while hi - lo > xtol:
+        mid = (lo + hi) / 2
+        p = probe(mid)
+        points.append((mid, p))
+        if above(p) == side_lo:
+            lo = mid
+        else:
+            hi = mid
+    # The interval is widened past probes whose side is within noise
+    ci_lo = max([s for s, p in points if s <= lo and above(p) == side_lo and sure(p)], default=lo)
+    ci_hi = min([s for s, p in points if s >= hi and above(p) != side_lo and sure(p)], default=hi)
+    return {"s": (lo + hi) / 2, "ci": (ci_lo, ci_hi), "found": True, "level": level}
+
+def _golden(probe, lo, hi, xtol):
+    """Golden-section search for the minimum of the seed-averaged metric."""
+    a, b = lo, hi
+    c, d = b - GOLDEN * (b - a), a + GOLDEN * (b - a)
+    pc, pd_ = probe(c), probe(d)
+    points = [(c, pc), (d, pd_)]
+    while b - a > xtol:
+        if pc["mean"] <= pd_["mean"]:
+            b, d, pd_ = d, c, pc
+            c = b - GOLDEN * (b - a)
+            pc = probe(c)
+            points.append((c, pc))
+        else:
+            a, c, pc = c, d, pd_
+            d = a + GOLDEN * (b - a)
+            pd_ = probe(d)
+            points.append((d, pd_))
+    s_best, best = min(points, key=lambda sp: sp[1]["mean"])
+    # Every probe statistically tied with the best one could be the minimum
+    tied = [s for s, p in points
+            if p["mean"] - best["mean"] <= Z95 * np.hypot(p["sem"], best["sem"])]
+    return {"s": float(s_best), "ci": (float(min(tied + [a])), float(max(tied + [b]))), "found": True, "level": None}
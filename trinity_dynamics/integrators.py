@@ -0,0 +1,149 @@
+"""
+Trinity Dynamics Simulation Framework
+Author: John Carroll Jr. (Two Mile Solutions LLC, Alaska)
+Date: 2025-10-01
+License: CC BY 4.0
+Signature: κ/π ≈ 1.01 stabilization principle
+Description: Adaptive-step integrators for the replicator system: embedded Dormand–Prince
+             RK5(4) and an exponential Rosenbrock–Euler scheme for stiff interaction matrices.
+"""
+
+import numpy as np
+
+# Dormand–Prince RK5(4) tableau
+_DP_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+]
+_DP_B = np.array([35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84, 0.0])
+_DP_E = _DP_B - np.array([5179/57600, 0.0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40])
+
+SAFETY = 0.9  # Step-size controller safety factor
+MIN_FACTOR, MAX_FACTOR = 0.2, 5.0  # Bounds on step-size change per step
+MAX_STEPS = 100000  # Hard cap on accepted + rejected steps
+
+def _error_norm(err, y, y_new, rtol, atol):
+    """RMS error scaled by mixed absolute/relative tolerance."""
+    scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+    return float(np.sqrt(np.mean((err / scale) ** 2)))
+
+def _hermite(t0, y0, f0, t1, y1, f1, t):
+    """Cubic Hermite interpolant between two accepted steps."""
+    h = t1 - t0
+    u = (t - t0) / h
+    h00, h10 = 2*u**3 - 3*u**2 + 1, u**3 - 2*u**2 + u
+    h01, h11 = -2*u**3 + 3*u**2, u**3 - u**2
+    return h00 * y0 + h10 * h * f0 + h01 * y1 + h11 * h * f1
+
+def _drive(step, f, y0, t_out, order, rtol, atol, h0, emit):
+    """
+    Shared adaptive loop: advances with step() under error control and samples
+    the solution at t_out with Hermite dense output.
+    Args:
+        step (callable): (t, y, f_y, h) -> (y_new, err_vector)
+        f (callable): Right-hand side f(y)
+        y0 (np.array): Initial state
+        t_out (np.array): Increasing output times starting at t_out[0]
+        order (int): Order of the error estimate, sets the controller exponent
+        rtol, atol (float): Tolerances
+        h0 (float, optional): Initial step (default: first output spacing)
+        emit (callable, optional): Receives each output sample in turn instead of
+                                   collecting them into an array
+    Returns:
+        (np.array, dict): Solution at t_out (None when emit is given) and {"steps", "rejected"}
+    """
+    y_out = None
+    if emit is None:
+        y_out = np.empty((len(t_out), len(y0)))
+
+        def emit(k, y):
+            y_out[k] = y
+    emit(0, np.array(y0, dtype=float))
+    t, y, fy = t_out[0], np.array(y0, dtype=float), f(y0)
+    t_end = t_out[-1]
+    h = h0 or (t_out[1] - t_out[0] if len(t_out) > 1 else 0.0)
+    accepted = rejected = 0
+    k = 1
+    while k < len(t_out):
+        if accepted + rejected >= MAX_STEPS:
+            raise RuntimeError(f"Step limit reached at t={t:.6g}")
+        h = min(h, t_end - t)
+        if h <= 1e-12 * max(1.0, abs(t)):
+            raise RuntimeError(f"Step size underflow at t={t:.6g}")
+        y_new, err = step(t, y, fy, h)
+        err_norm = _error_norm(err, y, y_new, rtol, atol)
+        if not np.isfinite(err_norm) or err_norm > 1.0:
+            rejected += 1
+            h *= max(MIN_FACTOR, SAFETY * err_norm ** (-1 / (order + 1))) if np.isfinite(err_norm) else MIN_FACTOR
+            continue
+        t_new, f_new = t + h, f(y_new)
+        while k < len(t_out) and t_out[k] <= t_new:
+            emit(k, _hermite(t, y, fy, t_new, y_new, f_new, t_out[k]))
+            k += 1
+        accepted += 1
+        t, y, fy = t_new, y_new, f_new
+        factor = MAX_FACTOR if err_norm == 0 else min(MAX_FACTOR, SAFETY * err_norm ** (-1 / (order + 1)))
+        h *= max(MIN_FACTOR, factor)
+    return y_out, {"steps": accepted, "rejected": rejected}
+
+def dopri5(f, y0, t_out, rtol=1e-6, atol=1e-9, h0=None, emit=None):
+    """
+    Embedded Dormand–Prince RK5(4) with error control.
+    Args:
+        f (callable): Right-hand side f(y) of the autonomous system
+        y0 (np.array): Initial state
+        t_out (np.array): Output times
+        rtol, atol (float): Tolerances
+        h0 (float, optional): Initial step size
+        emit (callable, optional): Per-sample callback emit(k, y) instead of a returned array
+    Returns:
+        (np.array, dict): Solution at t_out and step statistics
+    """
+    def step(t, y, fy, h):
+        k = [fy]
+        for i in range(1, 6):
+            k.append(f(y + h * sum(a * ki for a, ki in zip(_DP_A[i], k))))
+        y_new = y + h * sum(b * ki for b, ki in zip(_DP_B[:6], k))
+        k.append(f(y_new))
+        return y_new, h * sum(e * ki for e, ki in zip(_DP_E, k))
+
+    return _drive(step, f, y0, t_out, 4, rtol, atol, h0, emit)
+
+def exponential_euler(f, jac, y0, t_out, rtol=1e-6, atol=1e-9, h0=None, emit=None):
+    """
+    Exponential Rosenbrock–Euler scheme y+ = y + h·φ1(hJ)·f(y), with step-doubling
+    error control. The linearised part is propagated exactly, so stiff
+    interaction matrices do not force tiny steps.
+    Args:
+        f (callable): Right-hand side f(y)
+        jac (callable): Jacobian J(y)
+        y0 (np.array): Initial state
+        t_out (np.array): Output times
+        rtol, atol (float): Tolerances
+        h0 (float, optional): Initial step size
+        emit (callable, optional): Per-sample callback emit(k, y) instead of a returned array
+    Returns:
+        (np.array, dict): Solution at t_out and step statistics
+    """
+    from scipy.linalg import expm
+
+    n = len(y0)
+
+    def phi_step(y, fy, h):
+        # expm([[hJ, h f], [0, 0]]) carries h·φ1(hJ)·f in its last column
+        M = np.zeros((n + 1, n + 1))
+        M[:n, :n] = h * jac(y)
+        M[:n, n] = h * fy
+        return y + expm(M)[:n, n]
+
+    def step(t, y, fy, h):
+        y_full = phi_step(y, fy, h)
+        y_half = phi_step(y, fy, h / 2)
+        y_new = phi_step(y_half, f(y_half), h / 2)
+        return y_new, (y_new - y_full) / 3.0  # Richardson estimate for a 2nd-order pair
+
+    return _drive(step, f, y0, t_out, 2, rtol, atol, h0, emit)
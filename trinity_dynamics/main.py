@@ -5,79 +5,168 @@ Signature: κ/π ≈ 1.01
 """
 
 from __future__ import annotations
+import importlib.util
+import json
 import os
 import numpy as np
 import pandas as pd
 
-from .config import DEFAULT_X0, DEFAULT_A, S_FACTOR, DT_BASE, STEPS
+from .cache import ResultCache, CODE_MODULES, metrics_to_json
+from .columnar import read_sweep, METRIC_COLUMNS
+from .pipeline import Stage, run_stages
+from . import profiling
+from .profiling import span, profiled
+from .config import DEFAULT_X0, DEFAULT_A, S_FACTOR, DT_BASE, STEPS, SEED
 from .simulation import TrinitySimulation
 from .metrics import compute_metrics
-from .sensitivity import run_sensitivity
+from .sensitivity import run_sensitivity, grid_key
 from .visualize import plot_trajectories_matplotlib, plot_dashboard_plotly
 from .report import generate_report
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
-os.makedirs(DATA_DIR, exist_ok=True)
 
-def run_baseline_and_compare():
-    """Runs baseline comparison with and without κ/π."""
+def _baseline_run(sim, s_factor, cache):
+    """One baseline scenario, seeded like the matching sensitivity grid point so both share cache entries."""
+    point = dict(x0=DEFAULT_X0, A=DEFAULT_A, dt=DT_BASE, s=s_factor, seed=SEED)
+    key = grid_key(point, STEPS)
+    hit = cache.get(key, trajectory=True) if cache is not None else None
+    if hit is not None:
+        return hit[1], hit[0]
+    with span("simulate", s=s_factor):
+        x = sim.run_simulation(DEFAULT_X0, DEFAULT_A, s_factor=s_factor, dt=DT_BASE, steps=STEPS, seed=SEED)
+    if x is None:
+        return None, {}
+    with span("metrics", s=s_factor):
+        m = compute_metrics(x, DT_BASE)
+    if cache is not None:
+        cache.put(key, m, x)
+    return x, m
+
+@profiled("run_baseline")
+def run_baseline_and_compare(cache=None, png_path=None, plot=True):
+    """
+    Runs baseline comparison with and without κ/π, reusing cached runs when a ResultCache is given.
+    Args:
+        cache (ResultCache, optional): Result cache shared with the sensitivity sweep
+        png_path (str, optional): Comparison plot (default: DATA_DIR/comparison.png)
+        plot (bool): Draw the plot; the pipeline leaves it to the comparison stage
+    Returns:
+        tuple: (x, metrics) without and with κ/π, and the plot path (None if not drawn)
+    """
     sim = TrinitySimulation(n_agents=3)
 
     # Without κ/π
-    x_w = sim.run_simulation(DEFAULT_X0, DEFAULT_A, s_factor=1.0, dt=DT_BASE, steps=STEPS)
+    x_w, m_w = _baseline_run(sim, 1.0, cache)
     # With κ/π
-    x_c = sim.run_simulation(DEFAULT_X0, DEFAULT_A, s_factor=S_FACTOR, dt=DT_BASE, steps=STEPS)
-
-    m_w = compute_metrics(x_w, DT_BASE) if x_w is not None else {}
-    m_c = compute_metrics(x_c, DT_BASE) if x_c is not None else {}
+    x_c, m_c = _baseline_run(sim, S_FACTOR, cache)
 
-    png_path = os.path.join(DATA_DIR, "comparison.png")
-    try:
-        plot_trajectories_matplotlib(x_w, x_c, dt=DT_BASE, out_png=png_path)
-    except Exception as e:
-        print(f"Matplotlib plot failed: {e}")
-        png_path = None
+    png_path = (png_path or os.path.join(DATA_DIR, "comparison.png")) if plot else None
+    if png_path:
+        try:
+            plot_trajectories_matplotlib(x_w, x_c, dt=DT_BASE, out_png=png_path)
+        except Exception as e:
+            print(f"Matplotlib plot failed: {e}")
+            png_path = None
 
     return (x_w, m_w), (x_c, m_c), png_path
 
-def main():
-    """Orchestrates the full Trinity Dynamics workflow."""
-    print("🔹 Trinity Dynamics — Two Mile Solutions LLC (κ/π ≈ 1.01) 🔹")
+def _load_sweep(path):
+    if path.endswith(".parquet"):
+        return read_sweep(path, columns=["scenario", "dt", "s", "seed", *METRIC_COLUMNS])
+    return pd.read_csv(path)
 
-    # Baseline comparison
-    (x_w, m_w), (x_c, m_c), png_path = run_baseline_and_compare()
-    if m_w and m_c:
-        print("Baseline (no κ/π):", {k: m_w[k] for k in ["conv_time", "entropy", "energy"]})
-        print("Baseline (with κ/π):", {k: m_c[k] for k in ["conv_time", "entropy", "energy"]})
-    else:
-        print("Baseline run failed; check simulation logs.")
+def build_stages(data_dir=None, cache=None):
+    """
+    The workflow as a stage graph under data_dir: baseline runs, comparison plot,
+    sensitivity sweep, dashboard and report. Each stage only lists the modules that
+    decide its output, so e.g. editing report styling re-runs the report alone.
+    Returns:
+        list: Stage objects for pipeline.run_stages
+    """
+    data_dir = data_dir or DATA_DIR
+    path = lambda name: os.path.join(data_dir, name)
+    baseline_npz, baseline_json = path("baseline.npz"), path("baseline.json")
+    png_path, html_path, pdf_path = path("comparison.png"), path("dashboard.html"), path("report.pdf")
+    # pyarrow is optional: without it the sweep is collected in memory and written as CSV
+    parquet = importlib.util.find_spec("pyarrow") is not None
+    sweep_path = path("sensitivity_results.parquet" if parquet else "sensitivity_results.csv")
+
+    def baseline():
+        (x_w, m_w), (x_c, m_c), _ = run_baseline_and_compare(cache, plot=False)
+        if x_w is None or x_c is None:
+            raise RuntimeError("baseline run failed; check simulation logs")
+        np.savez(baseline_npz, without=x_w, with_s=x_c)
+        with open(baseline_json, "w") as f:
+            json.dump({"without": metrics_to_json(m_w), "with": metrics_to_json(m_c)}, f)
+
+    def comparison():
+        with np.load(baseline_npz) as f:
+            plot_trajectories_matplotlib(f["without"], f["with_s"], dt=DT_BASE, out_png=png_path)
+
+    def sensitivity():
+        print("Running sensitivity sweeps...")
+        if parquet:
+            run_sensitivity(steps=STEPS, batch_size=256, jobs=-1, cache=cache, out=sweep_path, progress=True)
+            print(f"Sensitivity Parquet saved: {sweep_path}")
+        else:
+            run_sensitivity(steps=STEPS, batch_size=256, jobs=-1, cache=cache).to_csv(sweep_path, index=False)
+            print(f"Sensitivity CSV saved: {sweep_path}")
 
-    # Sensitivity sweeps
-    print("Running sensitivity sweeps...")
-    df = run_sensitivity(steps=STEPS)
-    csv_path = os.path.join(DATA_DIR, "sensitivity_results.csv")
-    try:
-        df.to_csv(csv_path, index=False)
-        print(f"Sensitivity CSV saved: {csv_path}")
-    except Exception as e:
-        print(f"CSV write failed: {e}")
-
-    # Interactive dashboard
-    try:
-        fig = plot_dashboard_plotly(df)
+    def dashboard():
+        fig = plot_dashboard_plotly(_load_sweep(sweep_path))
         if fig is not None:
-            html_path = os.path.join(DATA_DIR, "dashboard.html")
             fig.write_html(html_path, include_plotlyjs="cdn")
             print(f"Interactive dashboard saved: {html_path}")
-    except Exception as e:
-        print(f"Plotly dashboard failed: {e}")
-
-    # PDF report
-    pdf_path = os.path.join(DATA_DIR, "report.pdf")
-    try:
-        generate_report(m_c if m_c else {}, df if df is not None else None, pdf_path, png_path)
-    except Exception as e:
-        print(f"Report generation failed: {e}")
+
+    def report():
+        with open(baseline_json) as f:
+            m_c = json.load(f)["with"]
+        generate_report(m_c, _load_sweep(sweep_path), pdf_path, png_path)
+
+    return [
+        Stage("baseline", baseline, [baseline_npz, baseline_json], sources=CODE_MODULES + ("config", "main")),
+        Stage("comparison", comparison, [png_path], [baseline_npz], sources=["visualize"]),
+        Stage("sensitivity", sensitivity, [sweep_path],
+              sources=CODE_MODULES + ("config", "sensitivity", "columnar")),
+        Stage("dashboard", dashboard, [html_path], [sweep_path], sources=["visualize"]),
+        Stage("report", report, [pdf_path], [baseline_json, sweep_path], sources=["report"],
+              optional=[png_path]),
+    ]
+
+def main(force=False, profile=None):
+    """
+    Orchestrates the full Trinity Dynamics workflow. Stages whose code and inputs are
+    unchanged since their last run are skipped; the dashboard and report run concurrently.
+    Args:
+        force (bool): Re-run every stage
+        profile (str, optional): Record timing spans and write them to this Chrome trace
+                                 JSON file, printing a p50/p95/p99 summary
+    Returns:
+        dict: Stage name -> "ran", "skipped", "failed" or "blocked"
+    """
+    print("🔹 Trinity Dynamics — Two Mile Solutions LLC (κ/π ≈ 1.01) 🔹")
+    if profile:
+        profiling.reset()
+        profiling.enable()
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    cache = ResultCache(os.path.join(DATA_DIR, "cache"))
+    status = run_stages(build_stages(DATA_DIR, cache), os.path.join(DATA_DIR, "stages"), force=force)
+    cache.evict()
+
+    if status["baseline"] in ("ran", "skipped"):
+        with open(os.path.join(DATA_DIR, "baseline.json")) as f:
+            baseline = json.load(f)
+        print("Baseline (no κ/π):", {k: baseline["without"][k] for k in ["conv_time", "entropy", "energy"]})
+        print("Baseline (with κ/π):", {k: baseline["with"][k] for k in ["conv_time", "entropy", "energy"]})
+    else:
+        print("Baseline run failed; check simulation logs.")
+    if profile:
+        n = profiling.export_chrome_trace(profile)
+        print(f"Chrome trace with {n} spans saved: {profile}")
+        print(profiling.summary().to_string(index=False, float_format="%.3f"))
+        profiling.enable(False)
+    return status
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
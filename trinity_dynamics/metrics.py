@@ -8,8 +8,9 @@ Description: Metrics module for Trinity dynamics, computing convergence, entropy
              oscillation, stability, and energy with robustness tests.
 """
 
+import math
 import numpy as np
-from scipy.signal import find_peaks
+from .config import CONV_THRESHOLD
 
 def _safe_entropy(p, eps=1e-12):
     """Safe Shannon entropy calculation in bits."""
@@ -17,6 +18,10 @@ def _safe_entropy(p, eps=1e-12):
     q = q / np.sum(q)
     return float(-np.sum(q * np.log2(q)))
 
+def tail_length(length):
+    """Number of final states whose variance is reported as stability: the last 10%, at least 100."""
+    return max(100, length // 10)
+
 def compute_metrics(x, dt):
     """
     Computes core metrics with robustness checks.
@@ -27,6 +32,8 @@ def compute_metrics(x, dt):
         dict: Metrics including convergence time, entropy, oscillation frequency,
               stability (variance), energy, and final state
     """
+    from scipy.signal import find_peaks
+
     if x is None or len(x) < 2:
         return {
             "conv_time": float("inf"), "entropy": 0.0, "osc_freq": 0.0,
@@ -37,8 +44,7 @@ def compute_metrics(x, dt):
     step_sizes = np.linalg.norm(diffs, axis=1)
 
     # Convergence time
-    threshold = 1e-4
-    idx = np.where(step_sizes < threshold)[0]
+    idx = np.where(step_sizes < CONV_THRESHOLD)[0]
     conv_time = float(idx[0] * dt) if len(idx) else float("inf")
 
     # Final state and entropy
@@ -50,8 +56,7 @@ def compute_metrics(x, dt):
     osc_freq = float(len(peaks) / (len(step_sizes) * dt)) if len(step_sizes) else 0.0
 
     # Stability (variance over last 10% or 100 steps)
-    tail_len = max(100, len(x) // 10)
-    tail = x[max(0, len(x) - tail_len):]
+    tail = x[max(0, len(x) - tail_length(len(x))):]
     stability = float(np.mean(np.var(tail, axis=0))) if len(tail) else float("inf")
 
     # Energy (total movement)
@@ -60,4 +65,189 @@ def compute_metrics(x, dt):
     return {
         "conv_time": conv_time, "entropy": entropy, "osc_freq": osc_freq,
         "stability": stability, "energy": energy, "final_state": final_state
-    }
\ No newline at end of file
+    }
+
+def _count_peaks_batch(s, valid):
+    """
+    Counts local maxima per row exactly as scipy.signal.find_peaks does, plateaus included:
+    a peak is a strict rise followed, after any run of equal samples, by a strict fall.
+    """
+    d = np.diff(s, axis=1)
+    sg = np.where(valid[:, 1:], np.sign(d), 0).astype(np.int8)
+    if sg.shape[1] < 2:
+        return np.zeros(len(s), dtype=int)
+    # Carry the last non-zero slope forward across plateaus
+    idx = np.where(sg != 0, np.arange(sg.shape[1])[None, :], 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    prev = np.take_along_axis(sg, idx, axis=1)
+    return np.sum((sg[:, 1:] == -1) & (prev[:, :-1] == 1), axis=1)
+
+def _step_sizes_batch(x):
+    """L2 step sizes (B, T-1), bit-identical to np.linalg.norm(np.diff(x_b, axis=0), axis=1)."""
+    d = np.diff(x, axis=1)
+    if d.shape[2] >= 8:
+        return np.linalg.norm(d, axis=2)
+    # For short rows numpy's reduction is a plain running sum, so adding whole
+    # agent planes in order gives the same bits without a strided length-n reduce
+    acc = d[:, :, 0] * d[:, :, 0]
+    for k in range(1, d.shape[2]):
+        acc += d[:, :, k] * d[:, :, k]
+    return np.sqrt(acc, out=acc)
+
+def compute_metrics_batch(x, dt, lengths=None):
+    """
+    Computes compute_metrics for many trajectories at once with array ops.
+    Args:
+        x (np.ndarray or list): Stacked trajectories (B, T, n), or a ragged list of (T_b, n)
+        dt (float or np.ndarray): Time step, scalar or per trajectory (B,)
+        lengths (np.ndarray, optional): Valid rows per trajectory when x is padded (B,)
+    Returns:
+        dict: Columns conv_time, entropy, osc_freq, stability, energy (B,) and
+              final_state (B, n), matching compute_metrics row by row
+    """
+    if isinstance(x, (list, tuple)):
+        lengths = np.array([len(xi) for xi in x], dtype=int)
+        n = max((xi.shape[1] for xi in x if len(xi)), default=0)
+        padded = np.zeros((len(x), int(lengths.max(initial=0)), n))
+        for b, xi in enumerate(x):
+            padded[b, :len(xi)] = xi
+        x = padded
+    x = np.asarray(x, dtype=float)
+    B, T, n = x.shape
+    lengths = np.full(B, T) if lengths is None else np.asarray(lengths, dtype=int)
+    dt = np.broadcast_to(np.asarray(dt, dtype=float), (B,))
+    ok = lengths >= 2
+    ragged = not np.all(lengths == T)
+
+    pos = np.arange(T)[None, :]
+    valid = pos[:, :-1] < (lengths - 1)[:, None]  # Valid step sizes
+    step_sizes = _step_sizes_batch(x) if T > 1 else np.zeros((B, 0))
+    if ragged:
+        step_sizes = np.where(valid, step_sizes, 0.0)
+
+    # Convergence time
+    below = (step_sizes < CONV_THRESHOLD) & valid
+    conv_time = np.where(below.any(axis=1), np.argmax(below, axis=1) * dt, np.inf)
+
+    # Final state and entropy
+    final_state = x[np.arange(B), np.maximum(lengths - 1, 0)]
+    q = np.clip(final_state, 1e-12, 1.0)
+    q = q / np.sum(q, axis=1, keepdims=True)
+    entropy = -np.sum(q * np.log2(q), axis=1)
+
+    # Oscillation frequency
+    peaks = _count_peaks_batch(step_sizes, valid)
+    osc_freq = peaks / (np.maximum(lengths - 1, 1) * dt)
+
+    # Stability (variance over last 10% or 100 steps)
+    tail_len = np.maximum(100, lengths // 10)
+    start = np.maximum(0, lengths - tail_len)
+    lo = int(start.min()) if B else 0
+    if not ragged:
+        stability = np.mean(np.var(x[:, lo:], axis=1), axis=1)
+    else:
+        # Zeros outside each tail leave the running sums, and so the variance, unchanged
+        window = x[:, lo:]
+        in_tail = ((pos[:, lo:] >= start[:, None]) & (pos[:, lo:] < lengths[:, None]))[:, :, None]
+        count = np.maximum(lengths - start, 1)[:, None]
+        mean = np.sum(np.where(in_tail, window, 0.0), axis=1) / count
+        var = np.sum(np.where(in_tail, (window - mean[:, None, :]) ** 2, 0.0), axis=1) / count
+        stability = np.mean(var, axis=1)
+
+    # Energy (total movement)
+    energy = np.sum(step_sizes, axis=1)
+
+    return {
+        "conv_time": np.where(ok, conv_time, np.inf), "entropy": np.where(ok, entropy, 0.0),
+        "osc_freq": np.where(ok, osc_freq, 0.0), "stability": np.where(ok, stability, np.inf),
+        "energy": np.where(ok, energy, np.inf),
+        "final_state": np.where(ok[:, None], final_state, np.nan)
+    }
+
+def split_metrics_batch(cols):
+    """Turns compute_metrics_batch columns back into one compute_metrics-style dict per trajectory."""
+    keys = ["conv_time", "entropy", "osc_freq", "stability", "energy"]
+    return [{**{k: float(cols[k][b]) for k in keys}, "final_state": cols["final_state"][b]}
+            for b in range(len(cols["energy"]))]
+
+class MetricsAccumulator:
+    """
+    Online compute_metrics: fed one state per step, it keeps O(n) memory however long
+    the run. Step sizes feed a compensated energy sum, the first sub-threshold step and
+    a 3-sample peak detector (plateaus count once, as in find_peaks); the tail variance
+    uses Welford's update. conv_time, osc_freq, entropy and final_state match
+    compute_metrics exactly, energy and stability to rounding.
+    """
+
+    def __init__(self, dt, length):
+        """
+        Args:
+            dt (float): Time step
+            length (int): Number of states that will be appended; fixes the tail window
+        """
+        self.dt = dt
+        self.length = length
+        self.tail_start = max(0, length - tail_length(length))
+        self.count = 0
+        self.prev = None
+        self.energy, self.energy_c = 0.0, 0.0
+        self.conv_step = None
+        self.last_step, self.rising, self.peaks = None, False, 0
+        self.origin = self.mean = self.m2 = None
+
+    def append(self, x):
+        """Adds the next raw state; it is normalized to proportions as the recorders do."""
+        # np.add.reduce skips np.sum's dispatch, which dominates at this size
+        y = np.abs(x)
+        y /= np.add.reduce(y)
+        if self.prev is not None:
+            d = y - self.prev
+            step = math.sqrt(np.add.reduce(d * d))
+            # Neumaier summation keeps the running energy within rounding of np.sum
+            total = self.energy + step
+            if abs(self.energy) >= step:
+                self.energy_c += (self.energy - total) + step
+            else:
+                self.energy_c += (step - total) + self.energy
+            self.energy = total
+            if self.conv_step is None and step < CONV_THRESHOLD:
+                self.conv_step = self.count - 1
+            if self.last_step is not None:
+                if step > self.last_step:
+                    self.rising = True
+                elif step < self.last_step:
+                    self.peaks += self.rising
+                    self.rising = False
+            self.last_step = step
+        if self.count >= self.tail_start:
+            k = self.count - self.tail_start + 1
+            if k == 1:
+                # Welford on offsets from the first tail state: settled runs have variances
+                # far below eps·|x|², and the shift keeps the mean updates from swamping them
+                self.origin, self.mean, self.m2 = y, np.zeros_like(y), np.zeros_like(y)
+            else:
+                z = y - self.origin
+                delta = z - self.mean
+                self.mean += delta / k
+                self.m2 += delta * (z - self.mean)
+        self.prev = y
+        self.count += 1
+
+    def result(self):
+        """
+        Returns the metrics dict of the states appended so far.
+        Raises:
+            ValueError: If fewer or more states than length were appended
+        """
+        if self.count < 2:
+            return compute_metrics(None, self.dt)
+        if self.count != self.length:
+            raise ValueError(f"Accumulator expected {self.length} states, got {self.count}")
+        n_steps = self.count - 1
+        return {
+            "conv_time": float(self.conv_step * self.dt) if self.conv_step is not None else float("inf"),
+            "entropy": _safe_entropy(self.prev),
+            "osc_freq": float(self.peaks / (n_steps * self.dt)),
+            "stability": float(np.mean(self.m2 / (self.count - self.tail_start))),
+            "energy": self.energy + self.energy_c, "final_state": self.prev
+        }
@@ -0,0 +1,113 @@
+"""
+Trinity Dynamics Simulation Framework
+Author: John Carroll Jr. (Two Mile Solutions LLC, Alaska)
+Date: 2025-10-01
+License: CC BY 4.0
+Signature: κ/π ≈ 1.01 stabilization principle
+Description: Networked replicator engine: one population per mesh node, coupled by
+             neighbour migration along a sparse graph and stepped as a single array.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from .config import NOISE_LEVEL
+from .metrics import compute_metrics, compute_metrics_batch, split_metrics_batch
+from .recording import make_recorder
+from .simulation import TrinitySimulation, NOISE_BLOCK, _issparse
+
+class NetworkSimulation(TrinitySimulation):
+    """Manages Trinity dynamics on every node of a graph, with migration between neighbours."""
+
+    def _migration_operator(self, adjacency, nodes):
+        """
+        Row-normalizes the adjacency once so migration mixes each node toward its
+        neighbours' mean state; isolated nodes keep their own population.
+        Raises:
+            ValueError: If the adjacency does not match the number of nodes
+        """
+        W = sp.csr_matrix(adjacency, dtype=float)
+        if W.shape != (nodes, nodes):
+            raise ValueError(f"Adjacency must be ({nodes}, {nodes}), got {W.shape}")
+        deg = np.asarray(W.sum(axis=1)).ravel()
+        inv = np.divide(1.0, deg, out=np.zeros_like(deg), where=deg > 0)
+        P = sp.diags(inv) @ W
+        isolated = (deg == 0)[:, None]
+        return lambda x: np.where(isolated, 0.0, P @ x - x)
+
+    def run_network(self, x0, A, adjacency, s_factor, dt=0.01, steps=2000, migration=0.1, seed=None,
+                    record="full", every=1, window=None):
+        """
+        Runs coupled node populations with the local update s·x·(Ax − xᵀAx) plus migration.
+        Args:
+            x0 (np.array): Initial conditions per node (nodes, n_agents), or one (n_agents,)
+                           state shared by every node
+            A (np.array or scipy.sparse matrix): Interaction matrix shared by all nodes
+            adjacency (scipy.sparse matrix or np.array): Graph adjacency (nodes, nodes)
+            s_factor (float): Scaling factor
+            dt (float): Time step
+            steps (int): Number of iterations
+            migration (float): Rate at which nodes move toward their neighbours' mean state
+            seed (int, optional): Seed for this run's noise stream (default: next spawned child)
+            record (str): Recording policy, as in run_simulation
+            every (int): Decimation stride for record="decimate"
+            window (int, optional): Ring length for record="ring"
+        Returns:
+            x (np.array): Time series of node proportions (T, nodes, n_agents)
+        Raises:
+            ValueError: If inputs are invalid
+        """
+        n = self.n_agents
+        x0 = np.asarray(x0, dtype=float)
+        if x0.ndim == 1:
+            x0 = np.tile(x0, (adjacency.shape[0], 1))
+        if x0.ndim != 2 or x0.shape[1] != n:
+            raise ValueError(f"Initial conditions must be (nodes, {n}), got {x0.shape}")
+        if A.shape != (n, n):
+            raise ValueError(f"Interaction matrix must be ({n}, {n}), got {A.shape}")
+        if not (0 < dt <= 1.0 and steps > 0 and migration >= 0):
+            raise ValueError("Invalid dt, steps or migration")
+        nodes = x0.shape[0]
+        migrate = self._migration_operator(adjacency, nodes)
+        if _issparse(A):
+            A = A.tocsr()
+            interact = lambda x: (A @ x.T).T
+        else:
+            interact = lambda x: x @ A.T
+        rec = make_recorder(record, steps, (nodes, n), every=every, window=window)
+
+        rng = self._stream(seed)
+        block = max(1, NOISE_BLOCK // (nodes * n))
+        x = x0.copy()
+        rec.append(x)
+        try:
+            for t in range(1, steps):
+                j = (t - 1) % block
+                if j == 0:
+                    noise = rng.normal(0, NOISE_LEVEL, (min(block, steps - t), nodes, n))
+                Ax = interact(x)
+                mean_feedback = np.einsum("ij,ij->i", x, Ax)[:, None]
+                dx = s_factor * x * (Ax - mean_feedback) + migration * migrate(x) + noise[j]
+                x = x + dt * dx
+                rec.append(x)
+        except Exception as e:
+            print(f"Network simulation error at step {t}: {e}")
+            return None
+        self.last_run = {"method": "euler", "steps": steps - 1, "rejected": 0, "stop_step": None,
+                         "offset": rec.offset, "stride": rec.stride}
+        return rec.result()
+
+def network_metrics(x, dt, aggregate=False):
+    """
+    Computes metrics for a networked run.
+    Args:
+        x (np.ndarray): Network time series (T, nodes, n_agents)
+        dt (float): Time step
+        aggregate (bool): Score the node-averaged population instead of every node
+    Returns:
+        dict or list: One metrics dict for the aggregate, else one per node
+    """
+    if x is None:
+        return compute_metrics(None, dt)
+    if aggregate:
+        return compute_metrics(x.mean(axis=1), dt)
+    return split_metrics_batch(compute_metrics_batch(np.swapaxes(x, 0, 1), dt))
@@ -0,0 +1,136 @@
+"""
+Trinity Dynamics Simulation Framework
+Author: John Carroll Jr. (Two Mile Solutions LLC, Alaska)
+Date: 2025-10-01
+License: CC BY 4.0
+Signature: κ/π ≈ 1.01 stabilization principle
+Description: Minimal stage graph with artifact caching: stages declare input and output
+             files, run as soon as their inputs exist (independent ones concurrently) and
+             are skipped when their fingerprint is unchanged.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .cache import source_hash
+from .profiling import span
+from .store import _write_json
+
+class Stage:
+    """
+    One pipeline step.
+    Args:
+        name (str): Unique stage name
+        func (callable): Called without arguments; must write every output
+        outputs (list): Files the stage writes
+        inputs (list): Files it reads; a stage producing one of them runs first
+        optional (list): Inputs it can do without; it still waits for their producers,
+                         but runs if they fail
+        sources (list): Package modules whose code decides the outputs
+        params (object, optional): Anything else that does (repr is hashed)
+    """
+
+    def __init__(self, name, func, outputs, inputs=(), sources=(), params=None, optional=()):
+        self.name = name
+        self.func = func
+        self.outputs = list(outputs)
+        self.inputs = list(inputs) + list(optional)
+        self.optional = set(optional)
+        self.sources = tuple(sources)
+        self.params = params
+
+    def fingerprint(self):
+        """Hash of the stage's code, parameters and input file contents."""
+        h = hashlib.sha256(self.name.encode())
+        h.update(source_hash(self.sources).encode())
+        h.update(repr(self.params).encode())
+        for path in self.inputs:
+            h.update(os.path.basename(path).encode())
+            h.update(file_hash(path).encode() if os.path.exists(path) else b"missing")
+        return h.hexdigest()
+
+def file_hash(path, block=2**20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(block), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _run_stage(stage, state_dir, force):
+    """Runs one stage unless it is up to date. Returns "ran" or "skipped"; raises on failure."""
+    state = os.path.join(state_dir, stage.name + ".json")
+    fp = stage.fingerprint()
+    if not force and all(os.path.exists(p) for p in stage.outputs):
+        try:
+            with open(state) as f:
+                if json.load(f)["fingerprint"] == fp:
+                    return "skipped"
+        except (OSError, ValueError, KeyError):
+            pass
+    with span(f"stage:{stage.name}"):
+        stage.func()
+    missing = [p for p in stage.outputs if not os.path.exists(p)]
+    if missing:
+        raise RuntimeError(f"did not write {', '.join(missing)}")
+    _write_json(state, {"fingerprint": fp})
+    return "ran"
+
+def run_stages(stages, state_dir, force=False, max_workers=None):
+    """
+    Runs a stage graph. Each stage starts once the stages producing its inputs have
+    finished, so independent stages run concurrently in threads.
+    Args:
+        stages (list): Stage objects
+        state_dir (str): Where stage fingerprints are kept
+        force (bool): Run every stage even if up to date
+        max_workers (int, optional): Concurrent stages (default: all ready ones)
+    Returns:
+        dict: Stage name -> "ran", "skipped", "failed" or "blocked" (an input stage failed)
+    Raises:
+        ValueError: On duplicate names or outputs, or a dependency cycle
+    """
+    by_name = {st.name: st for st in stages}
+    producers = {}
+    for st in stages:
+        for out in st.outputs:
+            if out in producers:
+                raise ValueError(f"Output {out} is written by both {producers[out]} and {st.name}")
+            producers[out] = st.name
+    if len(by_name) != len(stages):
+        raise ValueError("Stage names must be unique")
+    deps = {st.name: {producers[p] for p in st.inputs if p in producers} for st in stages}
+    needs = {st.name: {producers[p] for p in st.inputs if p in producers and p not in st.optional}
+             for st in stages}
+    os.makedirs(state_dir, exist_ok=True)
+
+    status, running = {}, {}
+    with ThreadPoolExecutor(max_workers or len(stages) or 1) as pool:
+        while len(status) < len(stages):
+            changed = True
+            while changed:
+                changed = False
+                for name, st in by_name.items():
+                    if name in status or name in running.values() or not deps[name] <= status.keys():
+                        continue
+                    if any(status[d] in ("failed", "blocked") for d in needs[name]):
+                        status[name] = "blocked"
+                        print(f"Stage {name} blocked by a failed input stage")
+                        changed = True
+                    else:
+                        running[pool.submit(_run_stage, st, state_dir, force)] = name
+            if not running:
+                if len(status) < len(stages):
+                    raise ValueError("Stage graph has a dependency cycle")
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = running.pop(fut)
+                try:
+                    status[name] = fut.result()
+                except Exception as e:
+                    print(f"Stage {name} failed: {e}")
+                    status[name] = "failed"
+                if status[name] == "skipped":
+                    print(f"Stage {name} up to date; skipped")
+    return status
@@ -0,0 +1,129 @@
+"""
+Trinity Dynamics Simulation Framework
+Author: John Carroll Jr. (Two Mile Solutions LLC, Alaska)
+Date: 2025-10-01
+License: CC BY 4.0
+Signature: κ/π ≈ 1.01 stabilization principle
+Description: Lightweight timing spans with Chrome-trace export and a percentile summary.
+             Disabled by default; a disabled span costs one flag check.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+
+PROFILE_ENV = "TRINITY_PROFILE"  # Set to 1 to enable profiling from the start
+PERCENTILES = (50, 95, 99)
+
+_enabled = os.environ.get(PROFILE_ENV) == "1"
+_events = []  # (name, start_ns, duration_ns, pid, thread id, args)
+_lock = threading.Lock()
+
+class _Span:
+    __slots__ = ("name", "args", "t0")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        _events.append((self.name, self.t0, time.perf_counter_ns() - self.t0, os.getpid(),
+                        threading.get_ident(), self.args))
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+_NULL = _NullSpan()
+
+def enable(on=True):
+    """Turns span recording on or off for this process."""
+    global _enabled
+    _enabled = bool(on)
+
+def is_enabled():
+    return _enabled
+
+def span(name, **args):
+    """
+    Times a block: with span("simulate", seed=3): ...
+    Args:
+        name (str): Span name; summaries group by it
+        args: Extra fields shown in the trace viewer
+    """
+    return _Span(name, args) if _enabled else _NULL
+
+def profiled(name=None):
+    """Decorator wrapping every call of a function in a span (named after it by default)."""
+    def wrap(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def inner(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(label, {}):
+                return func(*args, **kwargs)
+        return inner
+    return wrap
+
+def drain():
+    """Returns the recorded events and clears them (e.g. to ship them out of a worker process)."""
+    global _events
+    with _lock:
+        events, _events = _events, []
+    return events
+
+def add_events(events):
+    """Merges events recorded elsewhere, such as in pool workers."""
+    with _lock:
+        _events.extend(tuple(e) for e in events)
+
+def reset():
+    drain()
+
+def export_chrome_trace(path):
+    """
+    Writes the recorded spans as Chrome trace JSON (chrome://tracing, Perfetto).
+    Returns:
+        int: Number of spans written
+    """
+    events = list(_events)
+    trace = [{"name": name, "cat": "trinity", "ph": "X", "ts": t0 / 1e3, "dur": dur / 1e3, "pid": pid,
+              "tid": tid, "args": args} for name, t0, dur, pid, tid, args in events]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f, default=str)
+    return len(trace)
+
+def summary():
+    """
+    Returns:
+        pd.DataFrame: Per span name: count, total_ms, mean_ms and p50/p95/p99 in ms,
+                      slowest total first
+    """
+    import numpy as np
+    import pandas as pd
+
+    by_name = {}
+    for name, _, dur, *_ in list(_events):
+        by_name.setdefault(name, []).append(dur / 1e6)
+    rows = []
+    for name, durs in by_name.items():
+        d = np.array(durs)
+        row = {"span": name, "count": len(d), "total_ms": d.sum(), "mean_ms": d.mean()}
+        row.update({f"p{q}_ms": v for q, v in zip(PERCENTILES, np.percentile(d, PERCENTILES))})
+        rows.append(row)
+    columns = ["span", "count", "total_ms", "mean_ms"] + [f"p{q}_ms" for q in PERCENTILES]
+    return pd.DataFrame(rows, columns=columns).sort_values("total_ms", ascending=False, ignore_index=True)
@@ -0,0 +1,119 @@
+"""
+Trinity Dynamics Simulation Framework
+Author: John Carroll Jr. (Two Mile Solutions LLC, Alaska)
+Date: 2025-10-01
+License: CC BY 4.0
+Signature: κ/π ≈ 1.01 stabilization principle
+Description: Sweep journaling (resume after interruption) and progress reporting with
+             throughput, ETA and the slowest tasks.
+"""
+
+import heapq
+import json
+import os
+import time
+from .cache import metrics_to_json, metrics_from_json
+
+PROGRESS_SECONDS = 5.0  # Minimum interval between progress log lines
+SLOWEST = 5  # Slowest tasks kept in progress reports
+
+class SweepJournal:
+    """
+    Append-only JSON-lines record of finished grid points, keyed like the result cache.
+    Each line is flushed as it is written, so a killed sweep loses at most the chunk in
+    progress; a torn last line is ignored when the journal is loaded again.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.done = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.done[entry["key"]] = entry["metrics"]
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.file = open(path, "a")
+
+    def __len__(self):
+        return len(self.done)
+
+    def get(self, key):
+        m = self.done.get(key)
+        return None if m is None else metrics_from_json(dict(m))
+
+    def put(self, key, metrics):
+        entry = {"key": key, "metrics": metrics_to_json(metrics)}
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+        self.done[key] = entry["metrics"]
+
+    def close(self):
+        self.file.close()
+
+class SweepProgress:
+    """
+    Tracks a sweep chunk by chunk. Reports are dicts with completed/total grid points,
+    simulated points, sims_per_sec, eta (seconds), elapsed and the slowest tasks; they go
+    to a callback after every chunk or, by default, to a log line at most every
+    PROGRESS_SECONDS.
+    """
+
+    def __init__(self, total, callback=None, every=PROGRESS_SECONDS):
+        self.total = total
+        self.callback = callback
+        self.every = every
+        self.start = self.last_log = time.perf_counter()
+        self.completed = self.simulated = 0
+        self.slowest = []
+        self.tasks = 0
+
+    def update(self, chunk, simulated, seconds=None):
+        """
+        Records a finished chunk.
+        Args:
+            chunk (list): Its grid points
+            simulated (int): Points that had to be simulated (the rest came from a cache or journal)
+            seconds (float, optional): Time spent simulating it
+        """
+        self.completed += len(chunk)
+        self.simulated += simulated
+        if seconds is not None and simulated:
+            p = chunk[0]
+            task = {"task": self.tasks, "seconds": seconds, "points": simulated,
+                    "first": {"dt": p["dt"], "s": p["s"], "seed": p["seed"]}}
+            heapq.heappush(self.slowest, (seconds, self.tasks, task))
+            if len(self.slowest) > SLOWEST:
+                heapq.heappop(self.slowest)
+        self.tasks += 1
+        report = self.report()
+        if self.callback is not None:
+            self.callback(report)
+        else:
+            now = time.perf_counter()
+            if now - self.last_log >= self.every or self.completed == self.total:
+                self.last_log = now
+                print(self.format(report))
+
+    def report(self):
+        elapsed = time.perf_counter() - self.start
+        rate = self.simulated / elapsed if elapsed > 0 else 0.0
+        remaining = self.total - self.completed
+        eta = remaining / rate if rate > 0 else (0.0 if remaining == 0 else float("inf"))
+        return {"completed": self.completed, "total": self.total, "simulated": self.simulated,
+                "sims_per_sec": rate, "eta": eta, "elapsed": elapsed,
+                "slowest": [t for _, _, t in sorted(self.slowest, reverse=True)]}
+
+    @staticmethod
+    def format(report):
+        """One log line for a progress report."""
+        done, total = report["completed"], report["total"]
+        line = (f"Sweep {done}/{total} ({100 * done / max(total, 1):.1f}%), "
+                f"{report['sims_per_sec']:.1f} sims/s, ETA {report['eta']:.0f}s")
+        if report["slowest"]:
+            t = report["slowest"][0]
+            line += f", slowest task {t['seconds']:.2f}s at {t['first']}"
+        return line
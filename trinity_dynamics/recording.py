@@ -0,0 +1,108 @@
+"""
+Trinity Dynamics Simulation Framework
+Author: John Carroll Jr. (Two Mile Solutions LLC, Alaska)
+Date: 2025-10-01
+License: CC BY 4.0
+Signature: κ/π ≈ 1.01 stabilization principle
+Description: Trajectory recording policies (full, decimated, ring buffer, none) so memory
+             is bounded by what is kept rather than by the simulated horizon.
+"""
+
+import numpy as np
+
+RECORD_MODES = ("full", "decimate", "ring", "none")
+
+def normalize_inplace(x):
+    """Normalizes rows to proportions along the last axis without a second copy."""
+    np.abs(x, out=x)
+    x /= np.sum(x, axis=-1, keepdims=True)
+    return x
+
+class FullRecorder:
+    """Keeps every step in a preallocated (steps, *shape) buffer."""
+
+    def __init__(self, steps, shape):
+        self.buf = np.zeros((steps,) + tuple(shape))
+        self.count = 0
+        self.offset, self.stride = 0, 1
+
+    def append(self, x):
+        self.buf[self.count] = x
+        self.count += 1
+
+    def result(self):
+        """Returns the recorded rows, normalized in place."""
+        return normalize_inplace(self.buf[:self.count])
+
+class DecimatedRecorder(FullRecorder):
+    """Keeps every k-th step (step 0, k, 2k, ...)."""
+
+    def __init__(self, steps, shape, every):
+        if every < 1:
+            raise ValueError(f"Invalid decimation stride {every}")
+        super().__init__(-(-steps // every), shape)
+        self.stride = every
+        self.seen = 0
+
+    def append(self, x):
+        if self.seen % self.stride == 0:
+            super().append(x)
+        self.seen += 1
+
+class RingRecorder:
+    """Keeps only the last window steps in a ring buffer."""
+
+    def __init__(self, window, shape):
+        if window < 1:
+            raise ValueError(f"Invalid ring window {window}")
+        self.buf = np.zeros((window,) + tuple(shape))
+        self.count = 0
+        self.stride = 1
+
+    @property
+    def offset(self):
+        return max(0, self.count - len(self.buf))
+
+    def append(self, x):
+        self.buf[self.count % len(self.buf)] = x
+        self.count += 1
+
+    def result(self):
+        """Returns the kept window in chronological order."""
+        if self.count <= len(self.buf):
+            return normalize_inplace(self.buf[:self.count])
+        head = self.count % len(self.buf)
+        return normalize_inplace(np.concatenate((self.buf[head:], self.buf[:head])))
+
+class NullRecorder(RingRecorder):
+    """Keeps no trajectory, only the latest state."""
+
+    def __init__(self, shape):
+        super().__init__(1, shape)
+
+def make_recorder(record, steps, shape, every=1, window=None):
+    """
+    Builds the recorder for one run.
+    Args:
+        record (str): "full", "decimate" (every k-th step), "ring" (last window steps)
+                      or "none" (final state only)
+        steps (int): Planned number of steps
+        shape (tuple): Shape of one state
+        every (int): Decimation stride for "decimate"
+        window (int): Window length for "ring"
+    Returns:
+        Recorder with append(x), result(), offset and stride
+    Raises:
+        ValueError: If the mode or its parameters are invalid
+    """
+    if record == "full":
+        return FullRecorder(steps, shape)
+    if record == "decimate":
+        return DecimatedRecorder(steps, shape, every)
+    if record == "ring":
+        if window is None:
+            raise ValueError("record='ring' needs a window")
+        return RingRecorder(min(window, steps), shape)
+    if record == "none":
+        return NullRecorder(shape)
+    raise ValueError(f"Unknown record mode {record!r}; expected one of {RECORD_MODES}")
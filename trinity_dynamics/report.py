@@ -12,7 +12,9 @@ from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib import colors
+from .profiling import profiled
 
+@profiled()
 def generate_report(metrics, results_df, out_pdf_path, png_path=None):
     """
     Generates a PDF report with metrics, sensitivity results, and visualization.
@@ -64,4 +66,6 @@ def generate_report(metrics, results_df, out_pdf_path, png_path=None):
             doc.build(elements)
             print(f"PDF report saved: {out_pdf_path}")
         except Exception as e:
-            print(f"PDF build failed: {e}")
\ No newline at end of file
+            print(f"PDF build failed: {e}")
+    except Exception as e:
+        print(f"Report setup failed: {e}")
@@ -0,0 +1,191 @@
+"""
+Trinity Dynamics Simulation Framework
+Author: John Carroll Jr. (Two Mile Solutions LLC, Alaska)
+Date: 2025-10-01
+License: CC BY 4.0
+Signature: κ/π ≈ 1.01 stabilization principle
+Description: Quasi-random (Sobol, Latin hypercube) sampling of continuous parameter ranges,
+             adaptive refinement where metrics change fastest, and Sobol sensitivity indices.
+"""
+
+import warnings
+import numpy as np
+import pandas as pd
+from .config import SAMPLE_BOUNDS, SEED
+from .sensitivity import run_sensitivity
+
+SAMPLERS = ("sobol", "lhs", "random")
+
+def factor_slices(n_agents):
+    """Columns of the unit cube that drive each factor: x0 (n), A (off-diagonal pairs), dt, s."""
+    m = n_agents * (n_agents - 1) // 2
+    return {"x0": slice(0, n_agents), "A": slice(n_agents, n_agents + m),
+            "dt": slice(n_agents + m, n_agents + m + 1), "s": slice(n_agents + m + 1, n_agents + m + 2)}
+
+def _unit_sample(n, d, method, seed):
+    """n points in [0, 1)^d."""
+    from scipy.stats import qmc
+
+    if method == "sobol":
+        with warnings.catch_warnings():
+            # Non-power-of-two sizes lose Sobol's balance guarantee, not its low discrepancy
+            warnings.simplefilter("ignore", UserWarning)
+            return qmc.Sobol(d, scramble=True, seed=seed).random(n)
+    if method == "lhs":
+        return qmc.LatinHypercube(d, seed=seed).random(n)
+    if method == "random":
+        return np.random.default_rng(seed).random((n, d))
+    raise ValueError(f"Unknown sampler {method!r}; expected one of {SAMPLERS}")
+
+def point_from_unit(u, n_agents=3, bounds=None, seed=SEED):
+    """
+    Maps a unit-cube point to one grid point.
+    x0 uses normalized exponential spacings, which are uniform on the simplex when u is
+    uniform; A has a unit diagonal and symmetric off-diagonal entries.
+    """
+    bounds = {**SAMPLE_BOUNDS, **(bounds or {})}
+    cols = factor_slices(n_agents)
+    e = -np.log1p(-np.clip(u[cols["x0"]], 0.0, 1.0 - 1e-12))
+    x0 = e / e.sum() if e.sum() > 0 else np.full(n_agents, 1.0 / n_agents)
+    lo, hi = bounds["A"]
+    A = np.eye(n_agents)
+    iu = np.triu_indices(n_agents, 1)
+    A[iu] = lo + (hi - lo) * u[cols["A"]]
+    A.T[iu] = A[iu]
+    (dt_lo, dt_hi), (s_lo, s_hi) = bounds["dt"], bounds["s"]
+    return dict(x0=x0, A=A, dt=float(dt_lo + (dt_hi - dt_lo) * u[cols["dt"]][0]),
+                s=float(s_lo + (s_hi - s_lo) * u[cols["s"]][0]), seed=int(seed), u=np.asarray(u))
+
+def sample_grid(n, method="sobol", n_agents=3, bounds=None, seeds=None, seed=SEED):
+    """
+    Draws n grid points over the continuous ranges instead of a Cartesian product.
+    Args:
+        n (int): Number of points (powers of two suit Sobol best)
+        method (str): "sobol", "lhs" (Latin hypercube) or "random"
+        n_agents (int): Number of agents
+        bounds (dict, optional): Overrides for config.SAMPLE_BOUNDS
+        seeds (list, optional): Noise seeds, cycled over the points (default: [SEED])
+        seed (int): Scrambling seed of the sampler
+    Returns:
+        list: Grid-point dicts for run_sensitivity(grid=...), each with its unit-cube point "u"
+    """
+    seeds = seeds or [SEED]
+    d = factor_slices(n_agents)["s"].stop
+    U = _unit_sample(n, d, method, seed)
+    return [point_from_unit(u, n_agents, bounds, seeds[i % len(seeds)]) for i, u in enumerate(U)]
+
+def saltelli_grid(n, n_agents=3, bounds=None, seeds=None, seed=SEED):
+    """
+    Saltelli design for grouped Sobol indices: blocks A, B and one block per factor with
+    that factor's columns taken from B, n points each. Row j of every block shares a
+    noise seed so that the factor swaps are the only difference.
+    Returns:
+        list: n * (2 + n_factors) grid points, in block order
+    """
+    seeds = seeds or [SEED]
+    cols = factor_slices(n_agents)
+    UA, UB = np.hsplit(_unit_sample(n, 2 * cols["s"].stop, "sobol", seed), 2)
+    blocks = [UA, UB]
+    for sl in cols.values():
+        AB = UA.copy()
+        AB[:, sl] = UB[:, sl]
+        blocks.append(AB)
+    return [point_from_unit(u, n_agents, bounds, seeds[j % len(seeds)])
+            for U in blocks for j, u in enumerate(U)]
+
+def _finite(values):
+    """Censors non-finite metrics (e.g. conv_time=inf for runs that never settle) at the largest finite value."""
+    v = np.asarray(values, dtype=float)
+    finite = np.isfinite(v)
+    top = v[finite].max() if finite.any() else 0.0
+    return np.where(finite, v, top)
+
+def sobol_indices(values, n, n_agents=3, n_boot=200, seed=SEED):
+    """
+    First-order and total Sobol indices (Saltelli 2010 / Jansen estimators) per factor.
+    Args:
+        values (array-like): Metric for every point of saltelli_grid(n), in grid order
+        n (int): Base sample size used for the design
+        n_agents (int): Number of agents
+        n_boot (int): Bootstrap resamples for the 95% intervals
+        seed (int): Bootstrap seed
+    Returns:
+        pd.DataFrame: S1, S1_conf, ST, ST_conf indexed by factor (x0, A, dt, s)
+    """
+    names = list(factor_slices(n_agents))
+    f = _finite(values).reshape(2 + len(names), n)
+    fA, fB, fAB = f[0], f[1], f[2:]
+
+    def estimate(idx):
+        V = np.var(np.concatenate((fA[idx], fB[idx])))
+        if V == 0:
+            return np.zeros(len(names)), np.zeros(len(names))
+        s1 = np.mean(fB[idx] * (fAB[:, idx] - fA[idx]), axis=1) / V
+        st = 0.5 * np.mean((fA[idx] - fAB[:, idx]) ** 2, axis=1) / V
+        return s1, st
+
+    s1, st = estimate(np.arange(n))
+    rng = np.random.default_rng(seed)
+    boot = [estimate(rng.integers(0, n, n)) for _ in range(n_boot)]
+    z = 1.96
+    return pd.DataFrame({"S1": s1, "S1_conf": z * np.std([b[0] for b in boot], axis=0),
+                         "ST": st, "ST_conf": z * np.std([b[1] for b in boot], axis=0)}, index=names)
+
+def refine_grid(grid, values, n_new, k=5, n_agents=3, bounds=None, seeds=None):
+    """
+    Proposes points where the metric changes fastest: the midpoints of the nearest-neighbour
+    edges (in the unit cube) with the largest metric jumps.
+    Args:
+        grid (list): Sampled grid points carrying "u"
+        values (array-like): Metric per grid point
+        n_new (int): Number of points to add
+        k (int): Neighbours examined per point
+    Returns:
+        list: New grid points
+    """
+    from scipy.spatial import cKDTree
+
+    seeds = seeds or [SEED]
+    U = np.stack([p["u"] for p in grid])
+    v = _finite(values)
+    span = np.ptp(v) or 1.0
+    _, nbrs = cKDTree(U).query(U, k=min(k + 1, len(U)))
+    edges = {}
+    for i, row in enumerate(nbrs):
+        for j in row[1:]:
+            edges[(min(i, j), max(i, j))] = abs(v[i] - v[j]) / span
+    # Skip edges already split in an earlier round
+    seen = {tuple(u) for u in U}
+    steepest = [(i, j) for i, j in sorted(edges, key=edges.get, reverse=True)
+                if tuple((U[i] + U[j]) / 2) not in seen]
+    return [point_from_unit((U[i] + U[j]) / 2, n_agents, bounds, seeds[m % len(seeds)])
+            for m, (i, j) in enumerate(steepest[:n_new])]
+
+def adaptive_sweep(n=64, rounds=3, per_round=32, metric="conv_time", method="sobol", steps=2000, n_agents=3,
+                   bounds=None, seeds=None, seed=SEED, **sweep_kwargs):
+    """
+    Quasi-random sweep followed by rounds of refinement where the metric varies most.
+    Args:
+        n (int): Initial sample size
+        rounds (int): Refinement rounds
+        per_round (int): Points added per round
+        metric (str): Metric column that steers refinement
+        method (str): Initial sampler
+        steps (int): Simulation steps
+        sweep_kwargs: Passed on to run_sensitivity (batch_size, jobs, cache, ...)
+    Returns:
+        pd.DataFrame: run_sensitivity rows plus the unit-cube point "u" and the "round" it came from
+    """
+    grid = sample_grid(n, method, n_agents, bounds, seeds, seed)
+    frames, everything = [], []
+    for r in range(rounds + 1):
+        df = run_sensitivity(steps=steps, grid=grid, n_agents=n_agents, **sweep_kwargs)
+        df["round"] = r
+        frames.append(df)
+        # Failed runs are dropped from the rows, so match points back through "u"
+        done = {u: val for u, val in zip(df["u"], df[metric])}
+        everything += [(p, done[tuple(p["u"])]) for p in grid if tuple(p["u"]) in done]
+        if r < rounds:
+            grid = refine_grid([p for p, _ in everything], [val for _, val in everything], per_round,
+                               n_agents=n_agents, bounds=bounds, seeds=seeds)
+    return pd.concat(frames, ignore_index=True)
@@ -7,12 +7,31 @@ Signature: κ/π ≈ 1.01 stabilization principle
 Description: Sensitivity analysis module for parameter sweeps, with CSV exports.
 """
 
+import collections
 import itertools
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
-from .config import X0_LIST, A_LIST, DT_LIST, S_LIST, SEEDS
-from .simulation import TrinitySimulation
-from .metrics import compute_metrics
+from .cache import ResultCache, result_key
+from .columnar import SweepWriter
+from .aggregate import ScenarioAggregator
+from . import profiling
+from .profiling import span, profiled
+from .progress import SweepJournal, SweepProgress
+from .config import X0_LIST, A_LIST, DT_LIST, S_LIST, SEEDS, CONV_HOLD
+from .simulation import TrinitySimulation, steady_state as find_steady_state
+from .metrics import compute_metrics, compute_metrics_batch, split_metrics_batch, _safe_entropy
+
+STREAM_CHUNK = 4096  # Grid points per Parquet row group when streaming
+QUEUE_CHUNK = 64  # Grid points per work-queue task
+JOURNAL_CHUNK = 256  # Grid points per chunk when journaling or reporting progress
+SURROGATE_METRICS = ("conv_time", "energy", "stability")
+SURROGATE_INIT = 0.1  # Fraction of the grid simulated before the surrogate is first fitted
+LENGTH_SCALES = (0.1, 0.2, 0.4, 0.8)  # Candidate RBF length scales on the unit-scaled inputs
+NUGGETS = (1e-4, 1e-2, 1e-1)  # Candidate noise variances (relative), which absorb seed noise
 
 def param_grid(x0_list=None, a_list=None, dt_list=None, s_list=None, seeds=None):
     """Generates parameter combinations for sensitivity analysis."""
@@ -24,30 +43,428 @@ def param_grid(x0_list=None, a_list=None, dt_list=None, s_list=None, seeds=None)
     return [dict(x0=x0, A=A, dt=dt, s=s, seed=seed)
             for x0, A, dt, s, seed in itertools.product(x0_list, a_list, dt_list, s_list, seeds)]
 
-def run_sensitivity(steps=2000, grid=None, n_agents=3):
+def _result_row(p, m):
+    """Flattens one grid point and its metrics into a results row."""
+    return {
+        "dt": p["dt"], "s": p["s"], "seed": p["seed"],
+        "x0": tuple(p["x0"].round(3)), "A_tag": tuple(p["A"].round(3).flatten()),
+        **({"u": tuple(p["u"])} if "u" in p else {}),
+        **{k: m[k] for k in m if k != "final_state"}
+    }
+
+def _steady_metrics(state):
+    """Metrics row for a run answered by the equilibrium solver: only steady-state fields are known."""
+    nan = float("nan")
+    return {"conv_time": nan, "entropy": _safe_entropy(state), "osc_freq": nan,
+            "stability": nan, "energy": nan, "final_state": state, "solver": "equilibrium"}
+
+def _simulate_chunk(sim, chunk, steps, batch_size=None, tol=None, hold=CONV_HOLD, method="euler",
+                    steady_state=False):
+    """
+    Computes metrics for a list of grid points.
+    Returns:
+        list: One metrics dict per grid point, in order (None where a run failed)
+    """
+    out = [None] * len(chunk)
+    todo = list(range(len(chunk)))
+    twins = {}
+    if method != "euler":
+        # The adaptive integrators draw no noise, so points differing only by seed are one run
+        groups = {}
+        for i in todo:
+            groups.setdefault(grid_key(chunk[i], steps, method), []).append(i)
+        todo = [g[0] for g in groups.values()]
+        twins = {g[0]: g[1:] for g in groups.values() if len(g) > 1}
+    if steady_state:
+        todo = []
+        for i, p in enumerate(chunk):
+            eq = find_steady_state(p["A"], p["s"], p["x0"], horizon=steps * p["dt"])
+            if eq is None:
+                todo.append(i)
+            else:
+                out[i] = _steady_metrics(eq["state"])
+
+    if batch_size:
+        for k in range(0, len(todo), batch_size):
+            idx = todo[k:k + batch_size]
+            part = [chunk[i] for i in idx]
+            with span("simulate", runs=len(part)):
+                xs = sim.run_ensemble(np.stack([p["x0"] for p in part]), np.stack([p["A"] for p in part]),
+                                      s_factor=[p["s"] for p in part], dt=[p["dt"] for p in part],
+                                      steps=steps, seeds=[p["seed"] for p in part], tol=tol, hold=hold)
+            with span("metrics", runs=len(part)):
+                cols = compute_metrics_batch(xs, [p["dt"] for p in part], lengths=sim.last_run["stop_step"])
+            for i, m in zip(idx, split_metrics_batch(cols)):
+                out[i] = m
+    else:
+        for i in todo:
+            p = chunk[i]
+            if tol is None:
+                # Fixed-length runs are scored online and keep no trajectory, so metrics time is
+                # part of the simulate span
+                with span("simulate", seed=p["seed"], metrics="online"):
+                    x = sim.run_simulation(p["x0"], p["A"], s_factor=p["s"], dt=p["dt"], steps=steps,
+                                           seed=p["seed"], method=method, record="none", metrics=True)
+                if x is not None:
+                    out[i] = sim.last_run["metrics"]
+                continue
+            with span("simulate", seed=p["seed"]):
+                x = sim.run_simulation(p["x0"], p["A"], s_factor=p["s"], dt=p["dt"], steps=steps, seed=p["seed"],
+                                       tol=tol, hold=hold, method=method)
+            if x is not None:
+                with span("metrics", seed=p["seed"]):
+                    out[i] = compute_metrics(x, p["dt"])
+
+    if steady_state:
+        for i in todo:
+            if out[i] is not None:
+                out[i]["solver"] = "simulation"
+    for i, rest in twins.items():
+        for j in rest:
+            out[j] = dict(out[i]) if out[i] is not None else None
+    return out
+
+def _pack_chunk(chunk):
+    """Stacks a chunk's grid points into a few arrays so it pickles as one payload."""
+    return {k: np.stack([p[k] for p in chunk]) for k in ("x0", "A", "dt", "s", "seed")}
+
+def _unpack_chunk(packed):
+    """Inverse of _pack_chunk: grid-point dicts whose arrays are views into the payload."""
+    return [dict(x0=packed["x0"][i], A=packed["A"][i], dt=float(packed["dt"][i]), s=float(packed["s"][i]),
+                 seed=int(packed["seed"][i])) for i in range(len(packed["seed"]))]
+
+def _chunk_worker(n_agents, packed, steps, options):
+    """Process-pool task: one simulator per chunk, so start-up cost is paid once per chunk."""
+    return _simulate_chunk(TrinitySimulation(n_agents=n_agents), _unpack_chunk(packed), steps, **options)
+
+def _timed_chunk_worker(n_agents, packed, steps, options, profile=False):
+    """_chunk_worker plus the time it took, measured in the worker, and its profiling spans."""
+    profiling.enable(profile)
+    profiling.drain()  # Drop spans inherited from the parent through fork
+    t0 = time.perf_counter()
+    results = _chunk_worker(n_agents, packed, steps, options)
+    return results, time.perf_counter() - t0, profiling.drain()
+
+def queue_handler(spec, payload):
+    """Work-queue task: runs one packed chunk under the sweep settings in spec."""
+    from .workqueue import unpack_payload
+
+    return _chunk_worker(spec["n_agents"], unpack_payload(payload), spec["steps"], spec["options"])
+
+def _queue_results(queue, chunks, steps, n_agents, options, entries):
+    """
+    Coordinator side of a queued sweep: submits the chunks' uncached points, works on the
+    queue alongside any other workers, and waits for every task before returning results.
+    """
+    from .workqueue import WorkQueue, pack_payload, run_worker
+
+    spec = {"steps": steps, "n_agents": n_agents, "options": options}
+    wq = WorkQueue(queue)
+    try:
+        ids = [wq.submit(spec, pack_payload(_pack_chunk([chunk[i] for i in todo]))) if todo else None
+               for chunk, (_, _, todo) in zip(chunks, entries)]
+        run_worker(queue, queue_handler, wait=True)
+        submitted = [i for i in ids if i is not None]
+        wq.wait(submitted)
+        fresh = dict(zip(submitted, wq.results(submitted)))
+    finally:
+        wq.close()
+    return [fresh[i] if i is not None else [] for i in ids]
+
+def _pool_context():
+    """
+    Start method of sweep worker pools. Forking a process that is running other threads
+    (pipeline stages, say) can deadlock, so workers come from a fork server where available.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+def _chunk_results(chunks, steps, n_agents, jobs, options, stores=(), queue=None):
+    """
+    Yields (chunk, metrics, simulated count, seconds) in grid order. Points found in any of
+    the stores (result cache, sweep journal) are answered from it and the rest simulated
+    here, through a shared work queue, or, with jobs > 1, in a process pool that keeps at
+    most two chunks per worker in flight. Every grid point carries its own seed, so results
+    do not depend on which worker ran it.
+    """
+    key_options = {k: options[k] for k in ("method", "tol", "hold", "steady_state")}
+
+    def lookup(chunk):
+        if not stores:
+            return None, [None] * len(chunk), list(range(len(chunk)))
+        keys = [grid_key(p, steps, **key_options) for p in chunk]
+        results = [next((m for m in (st.get(k) for st in stores) if m is not None), None) for k in keys]
+        return keys, results, [i for i, m in enumerate(results) if m is None]
+
+    def merge(chunk, keys, results, todo, fresh, seconds=None):
+        for i, m in zip(todo, fresh):
+            results[i] = m
+            if m is not None:
+                for st in stores:
+                    st.put(keys[i], m)
+        return chunk, results, len(todo), seconds
+
+    if queue is not None:
+        entries = [lookup(chunk) for chunk in chunks]
+        for chunk, entry, fresh in zip(chunks, entries, _queue_results(queue, chunks, steps, n_agents, options,
+                                                                        entries)):
+            yield merge(chunk, *entry, fresh)
+        return
+    if jobs <= 1 or len(chunks) <= 1:
+        sim = TrinitySimulation(n_agents=n_agents)
+        for chunk in chunks:
+            keys, results, todo = lookup(chunk)
+            t0 = time.perf_counter()
+            fresh = _simulate_chunk(sim, [chunk[i] for i in todo], steps, **options)
+            yield merge(chunk, keys, results, todo, fresh, time.perf_counter() - t0)
+        return
+    def collect(chunk, keys, results, todo, future):
+        fresh, seconds, events = future.result() if future is not None else ([], None, [])
+        profiling.add_events(events)
+        return merge(chunk, keys, results, todo, fresh, seconds)
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(chunks)), mp_context=_pool_context()) as pool:
+        inflight = collections.deque()
+        for chunk in chunks:
+            keys, results, todo = lookup(chunk)
+            future = (pool.submit(_timed_chunk_worker, n_agents, _pack_chunk([chunk[i] for i in todo]), steps,
+                                  options, profiling.is_enabled()) if todo else None)
+            inflight.append((chunk, keys, results, todo, future))
+            if len(inflight) > 2 * jobs:
+                yield collect(*inflight.popleft())
+        while inflight:
+            yield collect(*inflight.popleft())
+
+def grid_key(p, steps, method="euler", tol=None, hold=CONV_HOLD, steady_state=False):
+    """
+    Cache key of one grid point under the given sweep options (batching does not enter).
+    The noise-free adaptive methods leave the seed out, so all seeds share one entry.
+    """
+    seed = p["seed"] if method == "euler" else None
+    return result_key(p["x0"], p["A"], p["dt"], p["s"], seed, steps, method=method, tol=tol,
+                      hold=hold if tol is not None else None, steady_state=steady_state)
+
+def _features(grid):
+    """Surrogate inputs: x0, A, dt and s of each grid point scaled to [0, 1]; constant columns are dropped."""
+    X = np.array([np.concatenate([np.ravel(p["x0"]), np.ravel(p["A"]), [p["dt"], p["s"]]]) for p in grid],
+                 dtype=float)
+    width = np.ptp(X, axis=0)
+    keep = width > 0
+    return (X[:, keep] - X[:, keep].min(axis=0)) / width[keep]
+
+def _sq_dist(X, Y):
+    return np.maximum(np.sum(X**2, axis=1)[:, None] + np.sum(Y**2, axis=1)[None, :] - 2 * X @ Y.T, 0.0)
+
+def _spread_indices(X, n):
+    """Greedy farthest-point choice of n rows of X, so a first design covers the grid."""
+    chosen = [0]
+    dist = np.sum((X - X[0])**2, axis=1)
+    dist[0] = -1.0
+    for _ in range(n - 1):
+        i = int(np.argmax(dist))
+        chosen.append(i)
+        dist = np.where(dist < 0, dist, np.minimum(dist, np.sum((X - X[i])**2, axis=1)))
+        dist[i] = -1.0
+    return chosen
+
+def _fit_gp(X, y):
+    """
+    Gaussian process with an RBF kernel on standardized targets; the length scale and
+    nugget are picked from LENGTH_SCALES x NUGGETS by marginal likelihood.
+    Returns:
+        callable: Xs -> (mean, sd, sd relative to the spread of y) of the latent function
+    """
+    from scipy.linalg import cho_factor, cho_solve
+
+    mu, scale = y.mean(), y.std() or 1.0
+    z = (y - mu) / scale
+    d2 = _sq_dist(X, X)
+    best = None
+    for ls in LENGTH_SCALES:
+        K = np.exp(-d2 / (2 * ls**2))
+        for nugget in NUGGETS:
+            try:
+                c = cho_factor(K + nugget * np.eye(len(X)), lower=True)
+            except np.linalg.LinAlgError:
+                continue
+            alpha = cho_solve(c, z)
+            ll = -0.5 * z @ alpha - np.sum(np.log(np.diag(c[0])))
+            if best is None or ll > best[0]:
+                best = (ll, ls, c, alpha)
+    _, ls, c, alpha = best
+
+    def predict(Xs):
+        Ks = np.exp(-_sq_dist(Xs, X) / (2 * ls**2))
+        rel = np.sqrt(np.clip(1.0 - np.einsum("ij,ji->i", Ks, cho_solve(c, Ks.T)), 0.0, None))
+        return mu + scale * (Ks @ alpha), scale * rel, rel
+    return predict
+
+def _surrogate_results(grid, tol, steps, simulate, init=SURROGATE_INIT):
+    """
+    Simulates a spread-out share of the grid, fits a GP per SURROGATE_METRICS column and
+    keeps simulating the most uncertain points until every remaining prediction is within
+    tol (sd relative to the metric's spread). conv_time is fitted censored at the horizon
+    steps * dt (inf, never converged) and without NaN rows (not computed, as for points the
+    equilibrium solver answered); predictions at the horizon are reported as inf.
+    Args:
+        simulate (callable): list of grid points -> their metrics dicts
+    Returns:
+        list: One metrics dict per grid point with "source" ("simulated" or "predicted")
+              and <metric>_sd; predicted rows leave entropy and osc_freq NaN
+    """
+    n = len(grid)
+    X = _features(grid)
+    horizon = np.array([steps * p["dt"] for p in grid])
+    results = [None] * n
+    done = np.zeros(n, dtype=bool)
+    batch = min(n, max(X.shape[1] + 2, int(np.ceil(init * n))))
+    todo = _spread_indices(X, batch)
+    while len(todo):
+        for i, m in zip(todo, simulate([grid[i] for i in todo])):
+            done[i] = True
+            if m is not None:
+                results[i] = {**m, "source": "simulated", **{f"{k}_sd": 0.0 for k in SURROGATE_METRICS}}
+        rest = np.flatnonzero(~done)
+        train = np.array([i for i in np.flatnonzero(done) if results[i] is not None], dtype=int)
+        if not len(rest):
+            break
+        risk = np.full(len(rest), np.inf)
+        preds = {}
+        if len(train):
+            risk[:] = 0.0
+            for k in SURROGATE_METRICS:
+                y = np.array([results[i][k] for i in train], dtype=float)
+                if k == "conv_time":
+                    y = np.where(np.isposinf(y), horizon[train], y)  # NaN (not computed) is dropped below
+                ok = np.isfinite(y)
+                if not ok.any():
+                    risk[:] = np.inf
+                    continue
+                mean, sd, rel = _fit_gp(X[train[ok]], y[ok])(X[rest])
+                preds[k] = (mean, sd)
+                risk = np.maximum(risk, rel)
+        over = risk > tol
+        if over.any():
+            todo = rest[over][np.argsort(-risk[over], kind="stable")][:batch]
+            continue
+        for j, i in enumerate(rest):
+            m = {k: float(preds[k][0][j]) for k in SURROGATE_METRICS}
+            if m["conv_time"] >= horizon[i]:
+                m["conv_time"] = float("inf")
+            results[i] = {"conv_time": m["conv_time"], "entropy": float("nan"), "osc_freq": float("nan"),
+                          "stability": m["stability"], "energy": m["energy"], "final_state": None,
+                          "source": "predicted", **{f"{k}_sd": float(preds[k][1][j]) for k in SURROGATE_METRICS}}
+        break
+    return results
+
+@profiled()
+def run_sensitivity(steps=2000, grid=None, n_agents=3, batch_size=None, tol=None, hold=CONV_HOLD,
+                    method="euler", steady_state=False, jobs=1, chunk_size=None, cache=None, out=None,
+                    queue=None, journal=None, progress=None, aggregate=False, keep_rows=False,
+                    surrogate=None):
     """
     Runs parameter sweeps and returns a DataFrame with results.
     Args:
         steps (int): Number of simulation steps
         grid (list): Custom parameter grid (default from config)
         n_agents (int): Number of agents
+        batch_size (int, optional): Advance this many grid points together through
+                                    TrinitySimulation.run_ensemble (default: one at a time)
+        tol (float, optional): Stop each run early once it has settled (see run_simulation)
+        hold (int): Settled window required before an early stop
+        method (str): Integrator passed to run_simulation; the adaptive ones make the
+                      dt axis an output sampling interval rather than a stability knob.
+                      They are also noise-free, so rows differing only by seed are
+                      identical: each such group is simulated and cached once
+        steady_state (bool): Only steady-state metrics are needed: answer each grid point
+                             from the equilibrium solver where it can decide and the flow
+                             arrives within steps * dt, leaving the dynamic metrics NaN,
+                             and simulate the rest ("solver" column)
+        jobs (int): Worker processes; 1 runs in this process, -1 uses every core.
+                    Rows match the serial path, in grid order
+        chunk_size (int, optional): Grid points per pool task or Parquet row group (default:
+                                    about four tasks per worker, or STREAM_CHUNK when streaming)
+        cache (ResultCache or str, optional): Result cache (or its directory); only grid
+                                              points missing from it are simulated
+        out (str, optional): Stream rows to this Parquet file as chunks finish instead of
+                             collecting a DataFrame (see columnar.read_sweep)
+        queue (str, optional): SQLite work-queue file on shared storage; this process
+                               coordinates and works, and workers on other hosts join with
+                               python -m trinity_dynamics.workqueue <queue>
+        journal (str, optional): Journal file of finished grid points; a re-run with the same
+                                 journal skips them, so an interrupted sweep resumes
+        progress (bool or callable, optional): True logs completed/total, sims/sec, ETA and
+                                               the slowest task periodically; a callable gets
+                                               the report dict after every chunk
+        aggregate (bool): Fold results across seeds as they arrive and return one row per
+                          scenario (see aggregate.ScenarioAggregator) instead of one per run
+        keep_rows (bool): With aggregate, also collect the per-run rows
+        surrogate (float, optional): Fit a Gaussian process on finished runs and only simulate
+                                     grid points whose predicted conv_time, energy or
+                                     stability has a relative sd above this tolerance (e.g.
+                                     0.1); rows gain "source" (simulated/predicted) and
+                                     <metric>_sd columns
     Returns:
-        pd.DataFrame: Results with parameters and metrics
+        pd.DataFrame: Results with parameters and metrics, or the Parquet path if out is given.
+                      With aggregate, the per-scenario DataFrame, or (aggregates, rows) when
+                      per-run rows were requested through keep_rows or out
     """
     grid = grid or param_grid()
-    sim = TrinitySimulation(n_agents=n_agents)
+    if batch_size and method != "euler":
+        raise ValueError("Batched sweeps use the fixed-step Euler integrator")
+    if jobs == 0:
+        raise ValueError("jobs must be a positive worker count or -1")
+    jobs = (os.cpu_count() or 1) if jobs < 0 else jobs
+    options = dict(batch_size=batch_size, tol=tol, hold=hold, method=method, steady_state=steady_state)
+    if isinstance(cache, str):
+        cache = ResultCache(cache)
+    if queue is not None:
+        chunk_size = chunk_size or QUEUE_CHUNK
+    elif jobs > 1:
+        chunk_size = chunk_size or max(1, -(-len(grid) // (jobs * 4)))
+    elif out:
+        chunk_size = chunk_size or STREAM_CHUNK
+    else:
+        chunk_size = chunk_size or (JOURNAL_CHUNK if journal or progress else max(1, len(grid)))
+
     rows = []
+    agg = ScenarioAggregator() if aggregate else None
+    collect = out is None and (keep_rows or not aggregate)
+    writer = SweepWriter(out, n_agents) if out else None
+    journal = SweepJournal(journal) if journal else None
+    stores = [st for st in (journal, cache) if st is not None]
+    tracker = SweepProgress(len(grid), None if progress is True else progress) if progress else None
+
+    def sweep(points):
+        chunks = [points[i:i + chunk_size] for i in range(0, len(points), chunk_size)]
+        for chunk, results, simulated, seconds in _chunk_results(chunks, steps, n_agents, jobs, options,
+                                                                 stores, queue):
+            if tracker is not None:
+                tracker.update(chunk, simulated, seconds)
+            yield chunk, results
 
-    for p in grid:
-        np.random.seed(p["seed"])
-        x = sim.run_simulation(p["x0"], p["A"], s_factor=p["s"], dt=p["dt"], steps=steps)
-        if x is not None:
-            m = compute_metrics(x, p["dt"])
-            rows.append({
-                "dt": p["dt"], "s": p["s"], "seed": p["seed"],
-                "x0": tuple(p["x0"].round(3)), "A_tag": tuple(p["A"].round(3).flatten()),
-                **{k: m[k] for k in m if k != "final_state"}
-            })
-
-    df = pd.DataFrame(rows)
-    return df
\ No newline at end of file
+    try:
+        if surrogate is not None:
+            simulate = lambda points: [m for _, results in sweep(points) for m in results]
+            finished = [(grid, _surrogate_results(grid, surrogate, steps, simulate))]
+        else:
+            finished = sweep(grid)
+        for chunk, results in finished:
+            if writer is not None:
+                writer.write(chunk, results)
+            elif collect:
+                rows += [_result_row(p, m) for p, m in zip(chunk, results) if m is not None]
+            if agg is not None:
+                for p, m in zip(chunk, results):
+                    agg.add(p, m)
+    finally:
+        if writer is not None:
+            writer.close()
+        if journal is not None:
+            journal.close()
+        if cache is not None:
+            cache.evict()
+    full = out if writer is not None else pd.DataFrame(rows)
+    if agg is None:
+        return full
+    return (agg.result(), full) if keep_rows or out else agg.result()
@@ -8,24 +8,201 @@ Description: Core simulation module for N-agent Trinity dynamics, with error han
              noise injection, and generalization. Rooted in Shinati-Itanihs (*Chiz'yaa*).
 """
 
+import functools
+import itertools
+import os
+import sys
 import numpy as np
-from config import NOISE_LEVEL, SEED
+from .config import NOISE_LEVEL, SEED, CONV_THRESHOLD, CONV_HOLD
+from .integrators import dopri5, exponential_euler
+from .metrics import MetricsAccumulator, tail_length
+from .recording import make_recorder
+from .store import TrajectoryStore, run_fingerprint
+
+METHODS = ("euler", "dopri5", "exponential")
+NOISE_BLOCK = 2**20  # Noise values drawn per RNG call (8 MB of float64)
+EQ_MAX_AGENTS = 16  # Support enumeration visits 2**n faces
+EQ_EPS = 1e-12  # Positivity / stability margin for equilibria
+EQ_HORIZON = 500.0  # Time (at s=1) integrated to find which attractor x0 belongs to
+EQ_BASIN_TOL = 1e-3  # Distance at which an integrated state counts as arrived
+EQ_SAMPLE = 0.1  # Time (at s=1) between the checks for arrival
+
+def _issparse(A):
+    """True for scipy.sparse matrices; scipy is only consulted if something already loaded it."""
+    sparse = sys.modules.get("scipy.sparse")
+    return sparse is not None and sparse.issparse(A)
+
+def replicator_drift(x, A, s=1.0):
+    """
+    Unchecked replicator update s·x·(Ax − xᵀAx) for the hot loops.
+    A may be dense or scipy.sparse, so one evaluation costs O(nnz(A)).
+    """
+    Ax = A @ x
+    mean_feedback = np.dot(x, Ax)
+    return s * x * (Ax - mean_feedback)
+
+def replicator_jacobian(x, A, s=1.0):
+    """
+    Jacobian of f(x) = s·x·(Ax − xᵀAx).
+    Args:
+        x (np.array): State vector (n,)
+        A (np.array): Interaction matrix (n, n)
+        s (float): Scaling factor
+    Returns:
+        np.array: Jacobian (n, n)
+    """
+    if _issparse(A):
+        A = A.toarray()
+    Ax = A @ x
+    grad_mean = Ax + A.T @ x
+    return s * (np.diag(Ax - x @ Ax) + x[:, None] * (A - grad_mean[None, :]))
+
+def _tangent_basis(n):
+    """Orthonormal basis (n, n-1) of the simplex tangent space {v : Σv = 0}."""
+    P = np.eye(n) - 1.0 / n
+    q, _ = np.linalg.qr(P[:, :n - 1])
+    return q
+
+@functools.lru_cache(maxsize=256)
+def _equilibria_cached(A_bytes, n):
+    """Support enumeration for one interaction matrix; s only rescales eigenvalues, so it is left out."""
+    A = np.frombuffer(A_bytes).reshape(n, n)
+    V = _tangent_basis(n)
+    found = []
+    for k in range(1, n + 1):
+        for support in itertools.combinations(range(n), k):
+            idx = list(support)
+            # Equal payoffs on the support and Σx = 1: [[A_SS, -1], [1ᵀ, 0]] [x_S; c] = [0; 1]
+            M = np.zeros((k + 1, k + 1))
+            M[:k, :k] = A[np.ix_(idx, idx)]
+            M[:k, k] = -1.0
+            M[k, :k] = 1.0
+            rhs = np.zeros(k + 1)
+            rhs[k] = 1.0
+            try:
+                sol = np.linalg.solve(M, rhs)
+            except np.linalg.LinAlgError:
+                continue
+            if np.any(sol[:k] <= EQ_EPS):
+                continue
+            x = np.zeros(n)
+            x[idx] = sol[:k]
+            J = replicator_jacobian(x, A)
+            eig = np.linalg.eigvals(V.T @ J @ V) if n > 1 else np.zeros(0)
+            found.append((tuple(x), support, tuple(eig)))
+    return tuple(found)
+
+def find_equilibria(A, s=1.0):
+    """
+    Finds interior and boundary fixed points of x·(Ax − xᵀAx) on the simplex.
+    Every support S is tried: x_S solves A_SS·x_S = c·1 with Σx_S = 1 and x_S > 0.
+    Stability comes from the Jacobian eigenvalues restricted to the simplex.
+    Args:
+        A (np.array or scipy.sparse matrix): Interaction matrix (n, n), n <= EQ_MAX_AGENTS
+        s (float): Scaling factor (rescales eigenvalues only)
+    Returns:
+        list: Dicts with "state", "support", "eigenvalues" and "stable"
+    Raises:
+        ValueError: If A is not square or too large for support enumeration
+    """
+    if _issparse(A):
+        A = A.toarray()
+    A = np.ascontiguousarray(A, dtype=float)
+    n = A.shape[0]
+    if A.shape != (n, n) or n > EQ_MAX_AGENTS:
+        raise ValueError(f"Equilibrium search needs a square matrix with at most {EQ_MAX_AGENTS} agents")
+    result = []
+    for x, support, eig in _equilibria_cached(A.tobytes(), n):
+        eig = s * np.array(eig)
+        result.append({"state": np.array(x), "support": support, "eigenvalues": eig,
+                       "stable": bool(np.all(eig.real < -EQ_EPS))})
+    return result
+
+@functools.lru_cache(maxsize=4096)
+def _basin_cached(x0_bytes, A_bytes, n):
+    """
+    Returns (index, time): the stable equilibrium the noise-free flow from x0 settles on
+    and the time (at s=1) at which it arrives, or (-1, inf).
+    """
+    A = np.frombuffer(A_bytes).reshape(n, n)
+    x = np.frombuffer(x0_bytes)
+    x = x / x.sum()
+    targets = [(i, np.array(e)) for i, (e, _, eig) in enumerate(_equilibria_cached(A_bytes, n))
+               if np.all(np.real(eig) < -EQ_EPS)]
+    # Integrate in short legs sampled every EQ_SAMPLE and stop as soon as the flow has arrived somewhere
+    legs = 50
+    t_leg = np.arange(0.0, EQ_HORIZON / legs + EQ_SAMPLE / 2, EQ_SAMPLE)
+    for k in range(legs):
+        xs = dopri5(lambda y: replicator_drift(y, A), x, t_leg, rtol=1e-6, atol=1e-9, h0=0.1)[0]
+        for i, e in targets:
+            near = np.flatnonzero(np.linalg.norm(xs - e, axis=1) < EQ_BASIN_TOL)
+            if len(near):
+                return i, k * t_leg[-1] + t_leg[near[0]]
+        x = xs[-1]
+    return -1, float("inf")
+
+def steady_state(A, s=1.0, x0=None, horizon=None):
+    """
+    Returns the asymptotically stable equilibrium a run settles on, or None.
+    A unique stable equilibrium is returned directly. With several (e.g. coordination
+    games), the basin of x0 is found once by a noise-free adaptive integration and
+    cached per (x0, A); s only rescales time, so it never changes the answer.
+    Noise keeps every strategy present, so boundary faces are not treated as invariant.
+    Args:
+        A (np.array): Interaction matrix (n, n)
+        s (float): Scaling factor
+        x0 (np.array, optional): Initial conditions, needed to pick among several attractors
+        horizon (float, optional): Length of the run (steps * dt); the equilibrium is only
+                                   returned if the flow from x0 arrives at it by then, so a
+                                   run still on its way is not reported as settled
+    Returns:
+        dict or None: Equilibrium as returned by find_equilibria
+    Raises:
+        ValueError: If horizon is given without x0
+    """
+    if horizon is not None and x0 is None:
+        raise ValueError("Checking arrival within a horizon needs the initial conditions x0")
+    eq = find_equilibria(A, s)
+    stable = [e for e in eq if e["stable"]]
+    if len(stable) == 1 and horizon is None:
+        return stable[0]
+    if x0 is None or not stable:
+        return None
+    A = np.ascontiguousarray(A.toarray() if _issparse(A) else A, dtype=float)
+    i, t = _basin_cached(np.ascontiguousarray(np.abs(x0), dtype=float).tobytes(), A.tobytes(), A.shape[0])
+    if i < 0 or (horizon is not None and t / s > horizon):
+        return None
+    return eq[i]
 
 class TrinitySimulation:
     """Manages N-agent Trinity dynamics simulation."""
     
-    def __init__(self, n_agents=3):
-        """Initialize with number of agents."""
+    def __init__(self, n_agents=3, seed=SEED):
+        """
+        Initialize with number of agents and a root seed.
+        Every run without an explicit seed draws its noise from a fresh child
+        stream spawned off the root SeedSequence, so runs are reproducible per
+        instance and never touch NumPy's global RNG.
+        """
         self.n_agents = n_agents
-        np.random.seed(SEED)
+        self.seed_seq = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_seq.spawn(1)[0])
+        self.last_run = {}
+
+    def _stream(self, seed=None):
+        """Returns the noise generator for one run: seeded if given, else the next spawned child."""
+        if seed is None:
+            return np.random.default_rng(self.seed_seq.spawn(1)[0])
+        return np.random.default_rng(np.random.SeedSequence(seed))
 
-    def trinity_dynamics(self, x, A, s=1.0):
+    def trinity_dynamics(self, x, A, s=1.0, noise=None):
         """
         Computes rate of change for N-agent replicator dynamics.
         Args:
             x (np.array): Current state vector (n_agents,)
-            A (np.array): Interaction matrix (n_agents, n_agents)
+            A (np.array or scipy.sparse matrix): Interaction matrix (n_agents, n_agents)
             s (float): Scaling factor (default 1.0, κ/π ≈ 1.01)
+            noise (np.array, optional): Pre-drawn noise for this step (default: drawn from self.rng)
         Returns:
             dx (np.array): Rate of change
         Raises:
@@ -33,22 +210,49 @@ class TrinitySimulation:
         """
         if len(x) != self.n_agents or A.shape != (self.n_agents, self.n_agents):
             raise ValueError(f"Dimension mismatch: x={len(x)}, A={A.shape}, n_agents={self.n_agents}")
-        Ax = A @ x
-        mean_feedback = np.dot(x, Ax)
-        dx = s * x * (Ax - mean_feedback)
-        return dx + np.random.normal(0, NOISE_LEVEL, self.n_agents)  # Noise
+        dx = replicator_drift(x, A, s)
+        if noise is None:
+            noise = self.rng.normal(0, NOISE_LEVEL, self.n_agents)
+        return dx + noise  # Noise
 
-    def run_simulation(self, x0, A, s_factor, dt=0.01, steps=2000):
+    def run_simulation(self, x0, A, s_factor, dt=0.01, steps=2000, seed=None, tol=None, hold=CONV_HOLD,
+                       method="euler", rtol=1e-6, atol=1e-9, record="full", every=1, window=None,
+                       store=None, checkpoint_every=1000, resume=True, metrics=False):
         """
         Runs simulation with given parameters.
         Args:
             x0 (np.array): Initial conditions
-            A (np.array): Interaction matrix
+            A (np.array or scipy.sparse matrix): Interaction matrix; sparse matrices are
+                                                 converted to CSR once and cost O(nnz) per step
             s_factor (float): Scaling factor
             dt (float): Time step
             steps (int): Number of iterations
+            seed (int, optional): Seed for this run's noise stream (default: next spawned child)
+            tol (float, optional): Stop once the state has moved less than tol per unit time
+                                   across the last hold steps, so the test does not depend
+                                   on dt (default: run all steps)
+            hold (int): Steps the settled window spans; it is widened to the metrics tail
+                        window so stability is measured on settled states only
+            method (str): "euler" (fixed step, noisy), or the adaptive noise-free
+                          "dopri5" (Dormand–Prince) or "exponential" (stiff) integrators,
+                          which sample their solution every dt
+            rtol, atol (float): Error tolerances for the adaptive integrators
+            record (str): "full", "decimate" (every k-th step), "ring" (last window steps)
+                          or "none" (final state only)
+            every (int): Decimation stride for record="decimate"
+            window (int, optional): Ring length for record="ring"
+            store (str, optional): Path of an on-disk .npy trajectory written progressively
+                                   in place of the in-memory record (see store.py)
+            checkpoint_every (int): Steps between checkpoints of state and RNG into the store
+            resume (bool): Continue an unfinished store from its last checkpoint (or return
+                           a finished one) instead of starting over
+            metrics (bool): Score every step with a MetricsAccumulator and put the result in
+                            self.last_run["metrics"]; with record="none" memory stays O(n)
         Returns:
-            x (np.array): Time series of agent proportions
+            x (np.array): Time series of agent proportions, truncated at the stop step
+                          (recorded in self.last_run["stop_step"]) when tol is set.
+                          self.last_run also reports integration steps taken and rejected,
+                          and the step index of row i as offset + i * stride.
         Raises:
             ValueError: If inputs are invalid
         """
@@ -56,14 +260,249 @@ class TrinitySimulation:
             raise ValueError("Initial conditions or matrix dimensions mismatch")
         if not (0 < dt <= 1.0 and steps > 0):
             raise ValueError("Invalid dt or steps")
+        if tol is not None and not (tol > 0 and hold > 0):
+            raise ValueError("Invalid tol or hold")
+        if metrics and (tol is not None or store is not None):
+            raise ValueError("Online metrics need a fixed-length, in-memory run (no tol or store)")
+        if method not in METHODS:
+            raise ValueError(f"Unknown method {method!r}; expected one of {METHODS}")
+        if _issparse(A):
+            if method == "exponential":
+                raise ValueError("The exponential integrator needs a dense interaction matrix")
+            A = A.tocsr()
+        if method != "euler":
+            if tol is not None or store is not None:
+                raise ValueError("Early exit and stores are only available with method='euler'")
+            rec = make_recorder(record, steps, (self.n_agents,), every=every, window=window)
+            acc = MetricsAccumulator(dt, steps) if metrics else None
+            return self._run_adaptive(x0, A, s_factor, dt, steps, method, rtol, atol, rec, acc)
 
-        x = np.zeros((steps, self.n_agents))
-        x[0] = x0
+        rng = self._stream(seed)
+        block = max(1, NOISE_BLOCK // self.n_agents)
+        x = np.array(x0, dtype=float)
+        start, noise, block_state = 1, None, None
+        converged, lag = False, None
+        if tol is not None:
+            hold = max(hold, tail_length(steps))
+            lag = np.empty((hold, self.n_agents))  # Normalized states of the last hold steps
+        acc = MetricsAccumulator(dt, steps) if metrics else None
+        if store is None:
+            rec = make_recorder(record, steps, (self.n_agents,), every=every, window=window)
+            rec.append(x)
+            if acc is not None:
+                acc.append(x)
+        else:
+            if record != "full" or checkpoint_every < 1:
+                raise ValueError("Stores record the full trajectory and need checkpoint_every >= 1")
+            rec, ckpt, x_ckpt = self._open_store(store, x0, A, s_factor, dt, steps, seed, resume,
+                                                 {"tol": tol, "hold": hold} if tol is not None else {})
+            if rec.complete:
+                self.last_run = {"method": "euler", "steps": rec.count - 1, "rejected": 0,
+                                 "stop_step": rec.count if rec.count < steps else None,
+                                 "offset": 0, "stride": 1, "resumed_from": rec.count - 1}
+                return rec.result()
+            if ckpt is None:
+                rec.append(x)
+            else:
+                # Rewind the RNG to the checkpointed block and redraw it, then carry on
+                x, start = x_ckpt, ckpt["step"] + 1
+                converged = ckpt["converged"]
+                rng.bit_generator.state = block_state = ckpt["rng_state"]
+                noise = rng.normal(0, NOISE_LEVEL, (min(block, steps - ckpt["block_start"]), self.n_agents))
+        stop = None
+        y_prev = np.abs(x) / np.sum(np.abs(x))
+        if lag is not None:
+            # A resumed store refills the window from the rows it already holds
+            first = max(0, start - hold)
+            past = np.abs(rec.buf[first:start] if store is not None else x[None])
+            lag[np.arange(first, start) % hold] = past / past.sum(axis=1, keepdims=True)
+        t = start
         try:
-            for t in range(1, steps):
-                dx = self.trinity_dynamics(x[t-1], A, s=s_factor)
-                x[t] = x[t-1] + dt * dx
-            return np.abs(x) / np.sum(np.abs(x), axis=1, keepdims=True)  # Normalize
+            for t in range(start, steps):
+                # Noise comes in blocks from this run's own stream; the draws are
+                # identical to one (steps - 1, n) call but memory stays bounded
+                j = (t - 1) % block
+                if j == 0:
+                    block_state = rng.bit_generator.state
+                    noise = rng.normal(0, NOISE_LEVEL, (min(block, steps - t), self.n_agents))
+                # Shapes were validated above, so the unchecked kernel runs here
+                x = x + dt * (replicator_drift(x, A, s_factor) + noise[j])
+                rec.append(x)
+                if acc is not None:
+                    acc.append(x)
+                if store is not None and t % checkpoint_every == 0:
+                    rec.checkpoint(t, x, block_state, t - j, {"converged": bool(converged)})
+                if lag is not None:
+                    # Step sizes on the normalized trajectory, as compute_metrics takes them:
+                    # never stop before its convergence step so conv_time is unchanged
+                    y = np.abs(x)
+                    y /= y.sum()
+                    d = y - y_prev
+                    y_prev = y
+                    converged = converged or np.sqrt(d @ d) < CONV_THRESHOLD
+                    # Settled: the net move across the window, a drift rate that neither shrinks
+                    # with dt nor follows the per-step noise, is below tol
+                    if converged and t >= hold:
+                        d = y - lag[t % hold]
+                        if np.sqrt(d @ d) < tol * hold * dt:
+                            stop = t + 1
+                            break
+                    lag[t % hold] = y
+            self.last_run = {"method": "euler", "steps": (stop or steps) - 1, "rejected": 0, "stop_step": stop,
+                             "offset": rec.offset, "stride": rec.stride}
+            if store is not None:
+                self.last_run["resumed_from"] = start - 1
+            if acc is not None:
+                self.last_run["metrics"] = acc.result()
+            return rec.result()
         except Exception as e:
             print(f"Simulation error at step {t}: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def _open_store(self, path, x0, A, s_factor, dt, steps, seed, resume, options):
+        """
+        Opens the trajectory store for a run, resuming it when allowed. options are the
+        early-exit settings, which decide where the trajectory ends.
+        Returns:
+            (TrajectoryStore, dict or None, np.array or None): Store, checkpoint and raw state
+        Raises:
+            ValueError: If an existing store belongs to a different run
+        """
+        fingerprint = run_fingerprint(x0, A, s_factor, dt, steps, seed, **options)
+        if resume and os.path.exists(path + ".json"):
+            rec = TrajectoryStore.open(path)
+            if rec.header["fingerprint"] != fingerprint:
+                raise ValueError(f"Trajectory store {path} was written by a different run")
+            if rec.complete:
+                return rec, None, None
+            ckpt, x = rec.restore()
+            if ckpt is not None:
+                return rec, ckpt, x
+        return TrajectoryStore.create(path, steps, (self.n_agents,), fingerprint), None, None
+
+    def _run_adaptive(self, x0, A, s_factor, dt, steps, method, rtol, atol, rec, acc=None):
+        """Integrates the noise-free system adaptively and samples it on the dt grid."""
+        f = lambda x: replicator_drift(x, A, s_factor)
+        t_out = np.arange(steps) * dt
+        x0 = np.asarray(x0, dtype=float)
+
+        def emit(k, y):
+            rec.append(y)
+            if acc is not None:
+                acc.append(y)
+        try:
+            if method == "dopri5":
+                _, info = dopri5(f, x0, t_out, rtol=rtol, atol=atol, emit=emit)
+            else:
+                _, info = exponential_euler(f, lambda x: replicator_jacobian(x, A, s_factor), x0, t_out,
+                                            rtol=rtol, atol=atol, emit=emit)
+        except Exception as e:
+            print(f"Simulation error ({method}): {e}")
+            return None
+        self.last_run = {"method": method, **info, "stop_step": None, "offset": rec.offset, "stride": rec.stride}
+        if acc is not None:
+            self.last_run["metrics"] = acc.result()
+        return rec.result()
+
+    def _ensemble_operator(self, A, B):
+        """
+        Validates the ensemble interaction matrices once and returns x (B, n) -> Ax (B, n).
+        Raises:
+            ValueError: If the matrices do not match the ensemble
+        """
+        n = self.n_agents
+        if _issparse(A):
+            if A.shape != (n, n):
+                raise ValueError(f"Shared interaction matrix must be ({n}, {n}), got {A.shape}")
+            A = A.tocsr()
+            return lambda x: (A @ x.T).T
+        if isinstance(A, (list, tuple)) and any(_issparse(a) for a in A):
+            if len(A) != B or any(a.shape != (n, n) for a in A):
+                raise ValueError(f"Expected {B} interaction matrices of shape ({n}, {n})")
+            blocks = sys.modules["scipy.sparse"].block_diag(A, format="csr")
+            return lambda x: (blocks @ x.ravel()).reshape(B, n)
+        A = np.asarray(A, dtype=float)
+        if A.shape == (n, n):
+            return lambda x: x @ A.T
+        if A.shape == (B, n, n):
+            return lambda x: np.einsum("bij,bj->bi", A, x)
+        raise ValueError(f"Interaction matrices must be ({B}, {n}, {n}), got {A.shape}")
+
+    def run_ensemble(self, x0, A, s_factor, dt=0.01, steps=2000, seeds=None, tol=None, hold=CONV_HOLD,
+                     record="full", every=1, window=None):
+        """
+        Runs B independent simulations together with vectorized updates.
+        Args:
+            x0 (np.array): Stacked initial conditions (B, n_agents)
+            A (np.array or scipy.sparse matrix): Interaction matrices (B, n_agents, n_agents),
+                          one shared (n_agents, n_agents) matrix, or a sequence of B
+                          sparse matrices (stepped as one block-diagonal CSR matrix)
+            s_factor (float or np.array): Scaling factor, scalar or per member (B,)
+            dt (float or np.array): Time step, scalar or per member (B,)
+            steps (int): Number of iterations
+            seeds (list, optional): Per-member noise seeds; member b then sees the same
+                                    noise as run_simulation(..., seed=seeds[b]) (default:
+                                    one spawned child stream per member)
+            tol (float, optional): Early-exit tolerance, as in run_simulation; integration
+                                   stops once every member has settled
+            hold (int): Steps the settled window spans, as in run_simulation
+            record (str): Recording policy, as in run_simulation
+            every (int): Decimation stride for record="decimate"
+            window (int, optional): Ring length for record="ring"
+        Returns:
+            x (np.array): Time series of agent proportions (B, steps, n_agents). With tol
+                          set, member b's own run ends at self.last_run["stop_step"][b]
+        Raises:
+            ValueError: If inputs are invalid
+        """
+        x0 = np.asarray(x0, dtype=float)
+        if x0.ndim != 2 or x0.shape[1] != self.n_agents:
+            raise ValueError(f"Initial conditions must be (B, {self.n_agents}), got {x0.shape}")
+        B = x0.shape[0]
+        interact = self._ensemble_operator(A, B)
+        s = np.broadcast_to(np.asarray(s_factor, dtype=float), (B,))[:, None]
+        dt = np.broadcast_to(np.asarray(dt, dtype=float), (B,))[:, None]
+        if not (np.all(dt > 0) and np.all(dt <= 1.0) and steps > 0):
+            raise ValueError("Invalid dt or steps")
+        if seeds is not None and len(seeds) != B:
+            raise ValueError(f"Expected {B} seeds, got {len(seeds)}")
+        if tol is not None and not (tol > 0 and hold > 0):
+            raise ValueError("Invalid tol or hold")
+        rec = make_recorder(record, steps, (B, self.n_agents), every=every, window=window)
+
+        # Noise is drawn in blocks per member so the hot loop is pure array arithmetic
+        streams = [self._stream(seed) for seed in (seeds if seeds is not None else [None] * B)]
+        block = max(1, NOISE_BLOCK // (B * self.n_agents))
+        x = x0.copy()
+        rec.append(x)
+        stop = np.full(B, steps)
+        y_prev = np.abs(x) / np.sum(np.abs(x), axis=1, keepdims=True)
+        converged = np.zeros(B, dtype=bool)
+        if tol is not None:
+            hold = max(hold, tail_length(steps))
+            lag = np.empty((hold, B, self.n_agents))
+            lag[0] = y_prev
+        for t in range(1, steps):
+            j = (t - 1) % block
+            if j == 0:
+                size = (min(block, steps - t), self.n_agents)
+                noise = np.stack([rng.normal(0, NOISE_LEVEL, size) for rng in streams], axis=1)
+            Ax = interact(x)
+            mean_feedback = np.einsum("bi,bi->b", x, Ax)[:, None]
+            dx = s * x * (Ax - mean_feedback) + noise[j]
+            x = x + dt * dx
+            rec.append(x)
+            if tol is not None:
+                y = np.abs(x) / np.sum(np.abs(x), axis=1, keepdims=True)
+                converged |= np.linalg.norm(y - y_prev, axis=1) < CONV_THRESHOLD
+                y_prev = y
+                if t >= hold:
+                    moved = np.linalg.norm(y - lag[t % hold], axis=1)
+                    stop[converged & (moved < tol * hold * dt[:, 0]) & (stop == steps)] = t + 1
+                    if np.all(stop < steps):
+                        break
+                lag[t % hold] = y
+        T = int(stop.max())
+        self.last_run = {"method": "euler", "steps": T - 1, "rejected": 0,
+                         "stop_step": stop if tol is not None else None, "offset": rec.offset, "stride": rec.stride}
+        return np.swapaxes(rec.result(), 0, 1)
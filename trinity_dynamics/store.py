@@ -0,0 +1,139 @@
+"""
+Trinity Dynamics Simulation Framework
+Author: John Carroll Jr. (Two Mile Solutions LLC, Alaska)
+Date: 2025-10-01
+License: CC BY 4.0
+Signature: κ/π ≈ 1.01 stabilization principle
+Description: Memory-mapped trajectory store (.npy plus a JSON header) with periodic
+             checkpoints of state and RNG, so long runs survive restarts.
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+from .recording import normalize_inplace
+
+STORE_VERSION = 1
+NORMALIZE_CHUNK = 65536  # Rows normalized per pass when a run completes
+
+def run_fingerprint(x0, A, s_factor, dt, steps, seed, **options):
+    """
+    Stable hash of the inputs that define a run, used to refuse mismatched resumes.
+    Args:
+        options: Anything else that changes the trajectory, such as the early-exit tol and hold
+    """
+    h = hashlib.sha256()
+    h.update(np.ascontiguousarray(x0, dtype=float).tobytes())
+    if hasattr(A, "tocsr"):
+        A = A.tocsr()
+        for part in (A.data, A.indices, A.indptr):
+            h.update(np.ascontiguousarray(part).tobytes())
+    else:
+        h.update(np.ascontiguousarray(A, dtype=float).tobytes())
+    h.update(repr((float(s_factor), float(dt), int(steps), seed)).encode())
+    if options:
+        h.update(repr(sorted(options.items())).encode())
+    return h.hexdigest()
+
+def _write_json(path, payload):
+    """Writes JSON atomically so a crash never leaves a torn header."""
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(payload, f)
+    os.replace(tmp, path)
+
+class TrajectoryStore:
+    """
+    Full-trajectory recorder backed by an on-disk .npy file.
+    The header (<path>.json) holds the shape, run fingerprint, completion flag and
+    the last checkpoint; the checkpointed state vector lives in <path>.ckpt.npy.
+    """
+
+    def __init__(self, path, buf, header):
+        self.path = path
+        self.buf = buf
+        self.header = header
+        self.count = header["count"]
+        self.offset, self.stride = 0, 1
+
+    @classmethod
+    def create(cls, path, steps, shape, fingerprint):
+        """Creates a fresh store for steps rows of the given state shape."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        buf = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(steps,) + tuple(shape))
+        header = {"version": STORE_VERSION, "steps": steps, "shape": list(shape), "fingerprint": fingerprint,
+                  "count": 0, "complete": False, "checkpoint": None}
+        store = cls(path, buf, header)
+        store._save_header()
+        return store
+
+    @classmethod
+    def open(cls, path):
+        """
+        Opens an existing store for appending or reading.
+        Raises:
+            FileNotFoundError: If the store or its header is missing
+            ValueError: If the header version is unknown
+        """
+        with open(path + ".json") as f:
+            header = json.load(f)
+        if header.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported trajectory store version {header.get('version')}")
+        return cls(path, np.lib.format.open_memmap(path, mode="r+"), header)
+
+    @property
+    def complete(self):
+        return self.header["complete"]
+
+    def _save_header(self):
+        _write_json(self.path + ".json", self.header)
+
+    def append(self, x):
+        self.buf[self.count] = x
+        self.count += 1
+
+    def checkpoint(self, step, x, rng_state, block_start, extra=None):
+        """
+        Flushes written rows and records everything needed to continue after step.
+        Args:
+            step (int): Last completed step (row index of x)
+            x (np.array): Raw (unnormalized) state at step
+            rng_state (dict): Bit-generator state at the start of the current noise block
+            block_start (int): Step at which the current noise block was drawn
+            extra (dict, optional): Additional JSON-serializable loop state
+        """
+        self.buf.flush()
+        tmp = self.path + ".ckpt.tmp.npy"
+        np.save(tmp, x)
+        os.replace(tmp, self.path + ".ckpt.npy")
+        self.header["count"] = self.count
+        self.header["checkpoint"] = {"step": step, "rng_state": rng_state, "block_start": block_start,
+                                     **(extra or {})}
+        self._save_header()
+
+    def restore(self):
+        """Returns (checkpoint dict, raw state) and rewinds appends to just after the checkpoint."""
+        ckpt = self.header["checkpoint"]
+        if ckpt is None:
+            return None, None
+        self.count = ckpt["step"] + 1
+        return ckpt, np.load(self.path + ".ckpt.npy")
+
+    def result(self):
+        """Normalizes the written rows in place, marks the store complete and returns them."""
+        rows = self.buf[:self.count]
+        if not self.complete:
+            # Normalizing is idempotent, so a crash part-way through is harmless
+            for i in range(0, self.count, NORMALIZE_CHUNK):
+                normalize_inplace(rows[i:i + NORMALIZE_CHUNK])
+            self.buf.flush()
+            self.header.update(count=self.count, complete=True)
+            self._save_header()
+        return rows
+
+def load_trajectory(path):
+    """Opens a completed store read-only as a memory-mapped (T, n) array."""
+    with open(path + ".json") as f:
+        header = json.load(f)
+    return np.load(path, mmap_mode="r")[:header["count"]]
@@ -7,8 +7,11 @@ Signature: κ/π ≈ 1.01 stabilization principle
 Description: Visualization module with Plotly interactive dashboard and Matplotlib fallback.
 """
 
+import os
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
 
 try:
     import plotly.graph_objects as go
@@ -17,38 +20,116 @@ except ImportError:
     PLOTLY_OK = False
 
 from .config import DT_BASE, S_FACTOR
+from .profiling import profiled
+
+SAVE_DPI = 150
+LEGEND_AGENTS = 10  # Agents listed in the trajectory legend
+
+def minmax_indices(y, n_buckets):
+    """
+    Shape-preserving decimation of a time series: the first and last sample plus the
+    min and max of each of n_buckets equal-length buckets, in time order. With one bucket
+    per pixel column the plot looks the same as the full series.
+    Args:
+        y (np.array): Samples (n,)
+        n_buckets (int): Number of buckets, e.g. the axis width in pixels
+    Returns:
+        np.array: Sorted indices to keep (all of them if n <= 2 * n_buckets)
+    """
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+    k = -(-n // n_buckets)
+    padded = np.concatenate([y, np.repeat(y[-1:], n_buckets * k - n)]).reshape(n_buckets, k)
+    offsets = np.arange(n_buckets) * k
+    idx = np.concatenate([[0, n - 1], offsets + np.argmin(padded, axis=1), offsets + np.argmax(padded, axis=1)])
+    return np.unique(np.minimum(idx, n - 1))
+
+def lttb_indices(points, n_out):
+    """
+    Largest-Triangle-Three-Buckets decimation: splits the samples into n_out - 2
+    consecutive buckets and keeps, from each, the point spanning the largest triangle with
+    the previously kept point and the next bucket's centroid. Buckets follow sample order,
+    so this also works for curves that are not functions of x, like phase portraits.
+    Args:
+        points (np.array): Samples (n, 2)
+        n_out (int): Points to keep, at least 3
+    Returns:
+        np.array: Sorted indices to keep
+    """
+    n = len(points)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    for b in range(n_out - 2):
+        lo, hi = edges[b], max(edges[b + 1], edges[b] + 1)
+        nxt = points[edges[b + 1]:max(edges[b + 2], edges[b + 1] + 1)] if b + 2 < len(edges) else points[-1:]
+        a, c = points[keep[b]], nxt.mean(axis=0)
+        bucket = points[lo:hi]
+        area = np.abs((a[0] - c[0]) * (bucket[:, 1] - a[1]) - (a[0] - bucket[:, 0]) * (c[1] - a[1]))
+        keep[b + 1] = lo + int(np.argmax(area))
+    return keep
+
+def _pixel_width(fig, ax):
+    return max(1, int(np.ceil(ax.bbox.width * SAVE_DPI / fig.dpi)))
+
+def _series(t, y, width):
+    idx = minmax_indices(y, width)
+    return np.column_stack([t[idx], y[idx]])
 
 def plot_trajectories_matplotlib(x_without, x_with, dt=DT_BASE, out_png=None):
-    """Static comparison plot as fallback."""
+    """
+    Static comparison plot as fallback. Series are decimated to the axes' pixel width
+    (min-max per pixel column, LTTB for the phase portrait) and each run's agents are
+    drawn as one LineCollection, so render time and PNG size depend on the output
+    resolution rather than on trajectory length or agent count. The figure is built
+    without pyplot, so it can be drawn from any thread (e.g. a pipeline stage).
+    Returns:
+        matplotlib.figure.Figure: The comparison figure
+    """
     t = np.arange(len(x_with)) * dt
-    fig, axes = plt.subplots(2, 2, figsize=(12, 9))
+    fig = Figure(figsize=(12, 9))
+    axes = fig.subplots(2, 2)
     fig.suptitle("Trinity Dynamics — κ/π Comparison", fontsize=14, fontweight="bold")
+    n_agents = x_with.shape[1]
+    colors = [f"C{i % 10}" for i in range(n_agents)]
 
     # Trajectories
     ax = axes[0, 0]
-    for i in range(x_with.shape[1]):
-        ax.plot(t, x_without[:, i], "--", alpha=0.4)
-        ax.plot(t, x_with[:, i], "-", alpha=0.9, label=f"Agent {i+1}" if i == 0 else None)
+    width = _pixel_width(fig, ax)
+    ax.add_collection(LineCollection([_series(t, x_without[:, i], width) for i in range(n_agents)],
+                                     colors=colors, linestyles="--", alpha=0.4))
+    ax.add_collection(LineCollection([_series(t, x_with[:, i], width) for i in range(n_agents)],
+                                     colors=colors, alpha=0.9))
+    ax.autoscale_view()
     ax.set_title("Trajectories (dashed=no κ/π, solid=with κ/π)")
     ax.set_xlabel("Time (s)"); ax.set_ylabel("Proportion"); ax.grid(alpha=0.3)
-    ax.legend() if x_with.shape[1] > 0 else None
+    if n_agents > 0:
+        ax.legend(handles=[Line2D([], [], color=colors[i], label=f"Agent {i+1}")
+                           for i in range(min(n_agents, LEGEND_AGENTS))])
 
     # Step sizes
     ax = axes[0, 1]
+    width = _pixel_width(fig, ax)
     step_w = np.linalg.norm(np.diff(x_without, axis=0), axis=1)
     step_c = np.linalg.norm(np.diff(x_with, axis=0), axis=1)
     tt = t[1:]
-    ax.semilogy(tt, step_w, "r--", alpha=0.7, label="without κ/π")
-    ax.semilogy(tt, step_c, "b-", alpha=0.8, label="with κ/π")
+    i_w, i_c = minmax_indices(step_w, width), minmax_indices(step_c, width)
+    ax.semilogy(tt[i_w], step_w[i_w], "r--", alpha=0.7, label="without κ/π")
+    ax.semilogy(tt[i_c], step_c[i_c], "b-", alpha=0.8, label="with κ/π")
     ax.axhline(1e-4, color="green", linestyle=":", label="Threshold")
     ax.set_title("Convergence Speed"); ax.set_xlabel("Time (s)"); ax.set_ylabel("Step Size")
     ax.grid(alpha=0.3); ax.legend()
 
     # Phase portrait
     ax = axes[1, 0]
-    if x_with.shape[1] >= 2:
-        ax.plot(x_without[:, 0], x_without[:, 1], "r--", alpha=0.5)
-        ax.plot(x_with[:, 0], x_with[:, 1], "b-", alpha=0.8)
+    if n_agents >= 2:
+        n_out = 2 * _pixel_width(fig, ax)
+        i_w, i_c = lttb_indices(x_without[:, :2], n_out), lttb_indices(x_with[:, :2], n_out)
+        ax.plot(x_without[i_w, 0], x_without[i_w, 1], "r--", alpha=0.5)
+        ax.plot(x_with[i_c, 0], x_with[i_c, 1], "b-", alpha=0.8)
         ax.set_title("Phase Space (Agent1 vs Agent2)")
         ax.set_xlabel("Agent 1"); ax.set_ylabel("Agent 2"); ax.grid(alpha=0.3)
     else:
@@ -64,11 +145,12 @@ def plot_trajectories_matplotlib(x_without, x_with, dt=DT_BASE, out_png=None):
     if out_png:
         try:
             os.makedirs(os.path.dirname(out_png), exist_ok=True)
-            fig.savefig(out_png, dpi=150)
-            plt.close(fig)
+            fig.savefig(out_png, dpi=SAVE_DPI)
         except Exception as e:
             print(f"Save failed: {e}")
+    return fig
 
+@profiled()
 def plot_dashboard_plotly(results_df, title="Interactive Trinity Dynamics"):
     """Interactive dashboard with dropdowns and sliders."""
     if not PLOTLY_OK:
@@ -86,9 +168,9 @@ def plot_dashboard_plotly(results_df, title="Interactive Trinity Dynamics"):
     y_without = subset["energy"].values
     y_with = subset["energy"] * 0.98  # Visual hint
 
-    fig.add_trace(go.Scatter(x=range(len(y_without)), y=y_without, mode="lines",
+    fig.add_trace(go.Scatter(x=np.arange(len(y_without)), y=y_without, mode="lines",
                              name=f"Energy (no κ/π), s=1.0"))
-    fig.add_trace(go.Scatter(x=range(len(y_with)), y=y_with, mode="lines",
+    fig.add_trace(go.Scatter(x=np.arange(len(y_with)), y=y_with, mode="lines",
                              name=f"Energy (κ/π), s≈{S_FACTOR:.5f}"))
 
     fig.update_layout(
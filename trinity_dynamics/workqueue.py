@@ -0,0 +1,208 @@
+"""
+Trinity Dynamics Simulation Framework
+Author: John Carroll Jr. (Two Mile Solutions LLC, Alaska)
+Date: 2025-10-01
+License: CC BY 4.0
+Signature: κ/π ≈ 1.01 stabilization principle
+Description: SQLite work queue on shared storage for multi-host sweeps: a coordinator
+             submits chunks, workers anywhere claim them under leases and write results back.
+             Run a worker with: python -m trinity_dynamics.workqueue QUEUE.db
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import socket
+import sqlite3
+import time
+import numpy as np
+from .cache import metrics_to_json, metrics_from_json
+
+LEASE_SECONDS = 600.0  # A claimed task is offered again if its worker has not finished by then
+MAX_ATTEMPTS = 3  # Claims per task before it is marked failed
+POLL_SECONDS = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    spec TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT
+)
+"""
+
+def pack_payload(arrays):
+    """Serializes a dict of arrays (a packed chunk) without pickle."""
+    buf = io.BytesIO()
+    np.savez(buf, **arrays)
+    return buf.getvalue()
+
+def unpack_payload(blob):
+    with np.load(io.BytesIO(blob)) as f:
+        return {k: f[k] for k in f.files}
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+class WorkQueue:
+    """
+    Task table in one SQLite file. Claims run inside BEGIN IMMEDIATE transactions, so any
+    number of processes on any host sharing the file can pull work without a broker. The
+    rollback journal is used rather than WAL, which needs shared memory that network
+    filesystems such as NFS do not provide.
+    """
+
+    def __init__(self, path, timeout=60.0):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=DELETE")
+        self.conn.execute(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def submit(self, spec, payload):
+        """
+        Adds a task, or finds the identical one already queued (a restarted coordinator
+        picks up earlier results).
+        Args:
+            spec (dict): JSON-serializable run settings shared by the task's points
+            payload (bytes): Packed grid points
+        Returns:
+            int: Task id
+        """
+        spec_json = json.dumps(spec, sort_keys=True)
+        key = hashlib.sha256(spec_json.encode() + payload).hexdigest()
+        self.conn.execute("INSERT OR IGNORE INTO tasks (key, spec, payload) VALUES (?, ?, ?)",
+                          (key, spec_json, payload))
+        return self.conn.execute("SELECT id FROM tasks WHERE key = ?", (key,)).fetchone()[0]
+
+    def claim(self, worker, lease=LEASE_SECONDS):
+        """
+        Leases the oldest pending task, or one whose lease has expired.
+        Returns:
+            (int, dict, bytes) or None: Task id, spec and payload
+        """
+        now = time.time()
+        with self._immediate():
+            while True:
+                row = self.conn.execute(
+                    "SELECT id, spec, payload, attempts FROM tasks WHERE status = 'pending' "
+                    "OR (status = 'leased' AND lease_expires < ?) ORDER BY id LIMIT 1", (now,)).fetchone()
+                if row is None:
+                    return None
+                task_id, spec, payload, attempts = row
+                if attempts < MAX_ATTEMPTS:
+                    break
+                self.conn.execute("UPDATE tasks SET status = 'failed', owner = NULL WHERE id = ?", (task_id,))
+            self.conn.execute("UPDATE tasks SET status = 'leased', owner = ?, lease_expires = ?, "
+                              "attempts = attempts + 1 WHERE id = ?", (worker, now + lease, task_id))
+        return task_id, json.loads(spec), payload
+
+    def complete(self, task_id, worker, results):
+        """Stores a task's results unless another worker already finished it."""
+        result = json.dumps([None if m is None else metrics_to_json(m) for m in results])
+        self.conn.execute("UPDATE tasks SET status = 'done', result = ?, owner = ? "
+                          "WHERE id = ? AND status != 'done'", (result, worker, task_id))
+
+    def release(self, task_id, error):
+        """Returns a task whose worker hit an error to the queue for another attempt."""
+        self.conn.execute("UPDATE tasks SET status = 'pending', owner = NULL, error = ? "
+                          "WHERE id = ? AND status = 'leased'", (error, task_id))
+
+    def counts(self):
+        """Tasks per status."""
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+
+    def results(self, task_ids):
+        """
+        Results of finished tasks, in the order given.
+        Raises:
+            RuntimeError: If any task failed for good or is not finished
+        """
+        out = []
+        for task_id in task_ids:
+            status, result, error = self.conn.execute(
+                "SELECT status, result, error FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if status != "done":
+                raise RuntimeError(f"Task {task_id} is {status}" + (f": {error}" if error else ""))
+            out.append([None if m is None else metrics_from_json(m) for m in json.loads(result)])
+        return out
+
+    def wait(self, task_ids, poll=POLL_SECONDS):
+        """Blocks until none of the given tasks is pending or leased."""
+        marks = ",".join("?" * len(task_ids))
+        while task_ids and self.conn.execute(
+                f"SELECT COUNT(*) FROM tasks WHERE id IN ({marks}) AND status IN ('pending', 'leased')",
+                task_ids).fetchone()[0]:
+            time.sleep(poll)
+
+    @contextlib.contextmanager
+    def _immediate(self):
+        """Write transaction taken up front, so two claimers never pick the same task."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+def run_worker(path, handler, worker=None, lease=LEASE_SECONDS, wait=False, poll=POLL_SECONDS):
+    """
+    Claims and runs tasks until the queue has nothing left to offer.
+    Args:
+        path (str): Queue database
+        handler (callable): (spec, payload) -> list of metrics dicts
+        worker (str, optional): Worker id (default: host:pid)
+        lease (float): Lease length in seconds; keep it above the slowest task
+        wait (bool): Keep polling while other workers hold leases, to retry them if they expire
+    Returns:
+        int: Tasks completed by this worker
+    """
+    worker = worker or default_worker_id()
+    queue = WorkQueue(path)
+    done = 0
+    try:
+        while True:
+            task = queue.claim(worker, lease)
+            if task is None:
+                if wait and queue.counts().get("leased"):
+                    time.sleep(poll)
+                    continue
+                return done
+            task_id, spec, payload = task
+            try:
+                results = handler(spec, payload)
+            except Exception as e:
+                print(f"Worker {worker} failed task {task_id}: {e}")
+                queue.release(task_id, str(e))
+                continue
+            queue.complete(task_id, worker, results)
+            done += 1
+    finally:
+        queue.close()
+
+def main(argv=None):
+    """Command-line worker for sensitivity sweep queues."""
+    from .sensitivity import queue_handler
+
+    parser = argparse.ArgumentParser(description="Run sensitivity sweep tasks from a shared queue")
+    parser.add_argument("queue", help="Queue database written by run_sensitivity(queue=...)")
+    parser.add_argument("--lease", type=float, default=LEASE_SECONDS, help="Lease length in seconds")
+    parser.add_argument("--wait", action="store_true", help="Stay until every leased task is finished")
+    args = parser.parse_args(argv)
+    n = run_worker(args.queue, queue_handler, lease=args.lease, wait=args.wait)
+    print(f"Completed {n} tasks")
+
+if __name__ == "__main__":
+    main()